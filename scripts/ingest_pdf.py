@@ -38,7 +38,7 @@ except ImportError:
     )
     sys.exit(1)
 
-from speaking_test.database import get_db
+from speaking_test.database import get_db, optimize_fts
 
 PARSER_NAME = "pymupdf"
 PARSER_VERSION = pymupdf.VersionBind  # e.g. "1.25.1"
@@ -97,24 +97,12 @@ def ingest_pdf(pdf_path: Path, conn: sqlite3.Connection) -> dict:
         page = doc[page_no]
         text = page.get_text()
 
-        # Save text to DB
+        # Save text to DB (a trigger keeps document_pages_fts in sync)
         conn.execute(
             "INSERT INTO document_pages (doc_id, page_no, text) VALUES (?, ?, ?)",
             (doc_id, page_no, text),
         )
 
-        # Populate FTS index
-        page_row = conn.execute(
-            "SELECT id FROM document_pages WHERE doc_id = ? AND page_no = ?",
-            (doc_id, page_no),
-        ).fetchone()
-        if page_row:
-            conn.execute(
-                "INSERT INTO document_pages_fts (rowid, text, doc_id, page_no) "
-                "VALUES (?, ?, ?, ?)",
-                (page_row["id"], text, doc_id, page_no),
-            )
-
         # Render full-page image
         pix = page.get_pixmap(dpi=144)
         img_name = f"page_{page_no:04d}.png"
@@ -184,14 +172,19 @@ def main():
     conn = get_db()
     print(f"Found {len(pdf_files)} PDF file(s) to process.\n")
 
+    ingested = 0
     for pdf_path in pdf_files:
         print(f"Processing: {pdf_path.name} ... ", end="", flush=True)
         result = ingest_pdf(pdf_path, conn)
         if result["status"] == "skipped":
             print(f"SKIPPED ({result['reason']})")
         else:
+            ingested += 1
             print(f"OK — {result['pages']} pages, {result['images']} images")
 
+    if ingested:
+        optimize_fts()
+
     print("\nDone. Output written to:", OUTPUT_DIR)
 
 
@@ -1,6 +1,4 @@
-import json
 import os
-import re
 import tempfile
 import time
 from datetime import datetime, timezone
@@ -11,17 +9,26 @@ import pandas as pd
 import streamlit as st
 from dotenv import load_dotenv
 from faster_whisper import WhisperModel
-from jiwer import wer
+from jiwer import (
+    Compose,
+    ExpandCommonEnglishContractions,
+    ReduceToListOfListOfWords,
+    RemoveMultipleSpaces,
+    RemovePunctuation,
+    Strip,
+    ToLowerCase,
+    wer,
+)
 
 from speaking_test.database import (
     create_session,
+    dump_json,
     get_attempts_for_session,
-    get_band_trend,
-    get_criterion_trends,
     get_detailed_weaknesses,
     get_document_list,
     get_document_page_assets,
     get_recent_sessions,
+    get_trends_bundle,
     get_weak_areas,
     get_writing_attempts,
     get_writing_criterion_trends,
@@ -57,12 +64,13 @@ from speaking_test.questions import (
     load_all_questions,
 )
 from speaking_test.review import (
+    REVIEW_COLUMNS,
     render_review,
     render_review_from_dict,
     render_writing_review,
     render_writing_review_from_dict,
 )
-from speaking_test.scorer import analyze_audio, estimate_band, generate_feedback
+from speaking_test.scorer import analyze_audio, estimate_band, generate_feedback, pitch_track
 from speaking_test.writing_questions import (
     get_random_writing_prompt,
     load_writing_prompts,
@@ -88,37 +96,33 @@ def _load_all():
     return load_all_questions()
 
 
-def normalize_text(text: str) -> str:
-    """Normalize text for fairer WER comparison."""
-    text = text.lower().strip()
-    contractions = {
-        "don't": "do not", "doesn't": "does not", "didn't": "did not",
-        "won't": "will not", "wouldn't": "would not", "couldn't": "could not",
-        "shouldn't": "should not", "isn't": "is not", "aren't": "are not",
-        "wasn't": "was not", "weren't": "were not", "haven't": "have not",
-        "hasn't": "has not", "hadn't": "had not", "can't": "cannot",
-        "i'm": "i am", "i've": "i have", "i'll": "i will", "i'd": "i would",
-        "you're": "you are", "you've": "you have", "you'll": "you will",
-        "he's": "he is", "she's": "she is", "it's": "it is",
-        "we're": "we are", "we've": "we have", "we'll": "we will",
-        "they're": "they are", "they've": "they have", "they'll": "they will",
-        "that's": "that is", "there's": "there is", "here's": "here is",
-        "what's": "what is", "who's": "who is", "let's": "let us",
-    }
-    for contraction, expansion in contractions.items():
-        text = text.replace(contraction, expansion)
-    text = re.sub(r"[^\w\s]", "", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+@st.cache_data(ttl=300)
+def _load_writing_prompts(test_type: str, task_type: int):
+    # TTL picks up prompts added by the ingestion scripts (separate process)
+    return load_writing_prompts(test_type=test_type, task_type=task_type)
+
+
+# Lowercase, expand contractions and strip punctuation for a fairer WER.
+_WER_TRANSFORM = Compose([
+    ToLowerCase(),
+    ExpandCommonEnglishContractions(),
+    RemovePunctuation(),
+    RemoveMultipleSpaces(),
+    Strip(),
+    ReduceToListOfListOfWords(),
+])
 
 
 def show_pitch_chart(audio_path: str):
     """Display a pitch contour chart for the recorded audio."""
     y, sr = librosa.load(audio_path, sr=None)
-    f0, voiced, _ = librosa.pyin(y, fmin=50, fmax=500, sr=sr)
-    mask = voiced & ~np.isnan(f0)
+    f0, voiced = pitch_track(y, sr)
+    # float32 halves the Arrow payload sent to the browser for long recordings
+    pitch = f0.astype(np.float32, copy=False)
+    pitch[~voiced] = np.nan
+    pitch = pitch[~np.isnan(pitch)]
     st.line_chart(
-        {"Pitch (Hz)": f0[mask]},
+        {"Pitch (Hz)": pitch},
         x_label="Time (frames)",
         y_label="Hz",
     )
@@ -169,15 +173,15 @@ def save_attempt_from_eval(
     )
 
     if isinstance(evaluation, EnhancedReview):
-        record.grammar_corrections = json.dumps(
+        record.grammar_corrections = dump_json(
             [gc.model_dump() for gc in evaluation.grammar_corrections]
         )
-        record.vocabulary_upgrades = json.dumps(
+        record.vocabulary_upgrades = dump_json(
             [vu.model_dump() for vu in evaluation.vocabulary_upgrades]
         )
-        record.improvement_tips = json.dumps(evaluation.improvement_priorities)
-        record.strengths = json.dumps(evaluation.strengths)
-        record.pronunciation_warnings = json.dumps(
+        record.improvement_tips = dump_json(evaluation.improvement_priorities)
+        record.strengths = dump_json(evaluation.strengths)
+        record.pronunciation_warnings = dump_json(
             [pw.model_dump() for pw in evaluation.pronunciation_warnings]
         )
 
@@ -266,9 +270,12 @@ def render_practice_mode():
                 if not transcript.strip():
                     st.error("No speech detected. Please try recording again.")
                 else:
-                    ref_norm = normalize_text(reference)
-                    hyp_norm = normalize_text(transcript)
-                    wer_score = wer(ref_norm, hyp_norm)
+                    wer_score = wer(
+                        reference,
+                        transcript,
+                        reference_transform=_WER_TRANSFORM,
+                        hypothesis_transform=_WER_TRANSFORM,
+                    )
 
                     with st.spinner("Analyzing speech..."):
                         metrics = analyze_audio(tmp_path, transcript, words)
@@ -382,13 +389,16 @@ def render_interview_mode():
                     combined = None
                     try:
                         if deep_review:
+                            progress = st.empty()
                             with st.spinner("Running deep AI review..."):
                                 content_eval = evaluate_answer_enhanced(
                                     question=q.text,
                                     part=q.part,
                                     transcript=transcript,
                                     band9_answer=qwa.band9_answer,
+                                    progress_cb=lambda n: progress.caption(f"Receiving review ({n} chunks)..."),
                                 )
+                            progress.empty()
                         else:
                             with st.spinner("Evaluating content with AI examiner..."):
                                 content_eval = evaluate_answer(
@@ -598,13 +608,16 @@ def render_mock_test_mode():
                 content_eval = None
                 combined = None
                 try:
+                    progress = st.empty()
                     with st.spinner("Evaluating..."):
                         content_eval = evaluate_answer_enhanced(
                             question=current_qwa.question.text,
                             part=current_part,
                             transcript=transcript,
                             band9_answer=current_qwa.band9_answer,
+                            progress_cb=lambda n: progress.caption(f"Receiving review ({n} chunks)..."),
                         )
+                    progress.empty()
                     combined = compute_combined_band(content_eval, metrics)
                 except Exception as e:
                     st.warning(f"Evaluation failed ({provider}): {e}")
@@ -728,19 +741,20 @@ def render_history_mode():
 
     tab1, tab2, tab3, tab4, tab5 = st.tabs(["Band Trend", "Criterion Breakdown", "Sessions", "Weaknesses", "Writing"])
 
+    bundle = get_trends_bundle(limit=50)
+    data = bundle["trend"]
+
     with tab1:
-        data = get_band_trend(limit=50)
         if data:
-            df = pd.DataFrame(data)
+            df = pd.DataFrame(data, columns=data[0].keys())
             df["timestamp"] = pd.to_datetime(df["timestamp"])
             st.line_chart(df, x="timestamp", y="overall_band", y_label="Band Score")
         else:
             st.info("No data yet. Complete some practice sessions to see trends.")
 
     with tab2:
-        data = get_criterion_trends(limit=50)
         if data:
-            df = pd.DataFrame(data)
+            df = pd.DataFrame(data, columns=data[0].keys())
             df["timestamp"] = pd.to_datetime(df["timestamp"])
             df = df.rename(columns={
                 "fluency_coherence": "Fluency & Coherence",
@@ -755,7 +769,7 @@ def render_history_mode():
                 y_label="Band Score",
             )
 
-            weak = get_weak_areas()
+            weak = bundle["weak_areas"]
             if weak:
                 weakest = min(weak, key=weak.get)
                 st.warning(
@@ -777,7 +791,7 @@ def render_history_mode():
                 f"({sess['attempt_count']} questions) — {sess['timestamp'][:16]}"
             )
             with st.expander(label):
-                attempts = get_attempts_for_session(sess["id"])
+                attempts = get_attempts_for_session(sess["id"], columns=REVIEW_COLUMNS)
                 for att in attempts:
                     st.markdown(
                         f"**Part {att['part']}** — {att['question_text'][:80]} "
@@ -832,27 +846,26 @@ def render_history_mode():
         # Writing band trend
         writing_trends = get_writing_criterion_trends(limit=50)
         if writing_trends:
-            wdf = pd.DataFrame(writing_trends)
-            wdf["timestamp"] = pd.to_datetime(wdf["timestamp"])
-            wdf = wdf.rename(columns={
-                "task_score": "Task Achievement",
-                "coherence_score": "Coherence",
-                "lexical_score": "Lexical Resource",
-                "grammar_score": "Grammar",
-                "overall_band": "Overall",
-            })
-            st.subheader("Writing Band Trends")
-            st.line_chart(
-                wdf,
-                x="timestamp",
-                y=["Task Achievement", "Coherence", "Lexical Resource", "Grammar", "Overall"],
-                y_label="Band Score",
+            # Only the plotted float32 columns, timestamps as the index
+            wdf = pd.DataFrame(
+                {
+                    label: np.asarray([r[col] for r in writing_trends], dtype=np.float32)
+                    for col, label in (
+                        ("task_score", "Task Achievement"),
+                        ("coherence_score", "Coherence"),
+                        ("lexical_score", "Lexical Resource"),
+                        ("grammar_score", "Grammar"),
+                        ("overall_band", "Overall"),
+                    )
+                },
+                index=pd.to_datetime([r["timestamp"] for r in writing_trends]),
             )
+            st.subheader("Writing Band Trends")
+            st.line_chart(wdf, y_label="Band Score")
 
             # Writing sessions drill-down
             st.subheader("Recent Writing Attempts")
-            writing_attempts = get_writing_attempts()
-            for att in writing_attempts[:20]:
+            for att in get_writing_attempts(limit=20):
                 prompt_info = get_writing_prompt_by_id(att["prompt_id"]) if att["prompt_id"] else None
                 prompt_label = prompt_info["prompt_text"][:60] if prompt_info else "Custom prompt"
                 label = (
@@ -919,10 +932,10 @@ def render_writing_mode():
         task_type = st.selectbox("Task", [1, 2], format_func=lambda x: f"Task {x}")
 
     # Load prompts from DB
-    prompts = load_writing_prompts(test_type=test_type, task_type=task_type)
+    prompts = _load_writing_prompts(test_type, task_type)
 
     # Topic filter (optional)
-    topics = sorted(set(p.topic for p in prompts if p.topic))
+    topics = sorted({p.topic for p in prompts if p.topic})
     topic_filter = None
     if topics:
         topic_choice = st.selectbox("Topic (optional)", ["Any"] + topics)
@@ -1067,16 +1080,16 @@ def render_writing_mode():
             }
 
             if isinstance(eval_result, WritingEnhancedReview):
-                attempt_data["paragraph_feedback"] = json.dumps(
+                attempt_data["paragraph_feedback"] = dump_json(
                     eval_result.paragraph_feedback
                 )
-                attempt_data["grammar_corrections"] = json.dumps(
+                attempt_data["grammar_corrections"] = dump_json(
                     [gc.model_dump() for gc in eval_result.grammar_corrections]
                 )
-                attempt_data["vocabulary_upgrades"] = json.dumps(
+                attempt_data["vocabulary_upgrades"] = dump_json(
                     [vu.model_dump() for vu in eval_result.vocabulary_upgrades]
                 )
-                attempt_data["improvement_tips"] = json.dumps(
+                attempt_data["improvement_tips"] = dump_json(
                     eval_result.improvement_priorities
                 )
                 attempt_data["raw_json"] = eval_result.model_dump_json()
@@ -2,44 +2,160 @@
 
 from __future__ import annotations
 
+import atexit
 import csv
+import functools
 import json
 import logging
+import os
+import queue
 import sqlite3
-from datetime import datetime, timezone
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 from speaking_test.models import AttemptRecord, SessionRecord
 
+try:
+    import orjson  # optional, faster JSON encoding/decoding
+except ImportError:
+    orjson = None
+
+_json_loads = orjson.loads if orjson else json.loads
+
 logger = logging.getLogger(__name__)
 
 DB_DIR = Path(__file__).resolve().parent.parent.parent / "data"
 DB_PATH = DB_DIR / "history.db"
 CSV_PATH = Path(__file__).resolve().parent.parent.parent / "questions_answers_updated.csv"
 
+# Top-5 aggregations over the JSON feedback columns of the latest N rows,
+# done in SQLite with json_each. Invalid or non-array JSON counts as empty;
+# ties keep the first-seen entry first (same order as Counter.most_common).
+_RECENT_JSON_ITEMS = (
+    "(SELECT j.value AS value, j.type AS type, "
+    "ROW_NUMBER() OVER (ORDER BY a.id DESC, j.key) AS seq "
+    "FROM (SELECT id, {column} AS doc FROM {table} ORDER BY id DESC LIMIT ?) AS a, "
+    "json_each(CASE WHEN json_valid(a.doc) AND json_type(a.doc) = 'array' "
+    "THEN a.doc ELSE '[]' END) AS j)"
+)
+_TOP_GRAMMAR_ERRORS_SQL = (
+    "SELECT TRIM(json_extract(value, '$.original'), char(32, 9, 10, 13)) AS original, "
+    "TRIM(json_extract(value, '$.corrected'), char(32, 9, 10, 13)) AS corrected, "
+    "COUNT(*) AS count FROM "
+    + _RECENT_JSON_ITEMS.format(column="grammar_corrections", table="{table}")
+    + " WHERE type = 'object' AND original != '' AND corrected != '' "
+    "GROUP BY original, corrected ORDER BY count DESC, MIN(seq) LIMIT 5"
+)
+_TOP_BASIC_WORDS_SQL = (
+    "SELECT LOWER(TRIM(json_extract(value, '$.basic_word'), char(32, 9, 10, 13))) AS word, "
+    "COUNT(*) AS count FROM "
+    + _RECENT_JSON_ITEMS.format(column="vocabulary_upgrades", table="{table}")
+    + " WHERE type = 'object' AND word != '' "
+    "GROUP BY word ORDER BY count DESC, MIN(seq) LIMIT 5"
+)
+_TOP_TIPS_SQL = (
+    "SELECT TRIM(value, char(32, 9, 10, 13)) AS tip, COUNT(*) AS count FROM "
+    + _RECENT_JSON_ITEMS.format(column="improvement_tips", table="{table}")
+    + " WHERE type = 'text' AND tip != '' "
+    "GROUP BY tip ORDER BY count DESC, MIN(seq) LIMIT 5"
+)
+# UTC timestamp generated by SQLite, in the same ISO layout as
+# datetime.isoformat() (millisecond precision). A bound NULL falls back to it.
+_SQL_NOW = "strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now')"
+_TS_OR_NOW = f"COALESCE(?, {_SQL_NOW})"
+
+# INSERT/UPDATE ... RETURNING (SQLite 3.35+) hands back the new id and the
+# refreshed session aggregates from the same statement step.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_RETURNING_ID = " RETURNING id" if _HAS_RETURNING else ""
+
+# Statement text for the insert sites. sqlite3 caches prepared statements per
+# connection keyed on the SQL string, so each call site reuses one constant.
+_INSERT_QUESTION_SQL = (
+    "INSERT INTO questions (part, topic, question_text, cue_card, source, "
+    "band9_answer, answer_variant) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_INSERT_SESSION_SQL = f"INSERT INTO sessions (timestamp, mode) VALUES ({_TS_OR_NOW}, ?)"
+_INSERT_ATTEMPT_SQL = (f"""INSERT INTO attempts (
+    session_id, timestamp, part, topic, question_text, transcript,
+    duration, overall_band, fluency_coherence, lexical_resource,
+    grammatical_range, pronunciation, speech_rate, pause_ratio,
+    pronunciation_confidence, examiner_feedback,
+    grammar_corrections, vocabulary_upgrades, improvement_tips,
+    band9_answer, strengths, pronunciation_warnings, source
+) VALUES (?, {_TS_OR_NOW}, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+) + _RETURNING_ID
+_INSERT_WRITING_ATTEMPT_SQL = (f"""INSERT INTO writing_attempts (
+    session_id, timestamp, prompt_id, task_type, essay_text, word_count,
+    task_score, coherence_score, lexical_score, grammar_score, overall_band,
+    examiner_feedback, paragraph_feedback, grammar_corrections,
+    vocabulary_upgrades, improvement_tips, provider, raw_json
+) VALUES (?, {_TS_OR_NOW}, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+) + _RETURNING_ID
+_UPDATE_SESSION_STATS_SQL = (
+    "UPDATE sessions SET attempt_count = attempt_count + :count, "
+    "band_total = band_total + :total, "
+    "overall_band = ROUND((band_total + :total) / (attempt_count + :count) * 2) / 2.0 "
+    "WHERE id = :id"
+) + (" RETURNING attempt_count, overall_band" if _HAS_RETURNING else "")
+
 
 def _get_connection() -> sqlite3.Connection:
     DB_DIR.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
+    # Room in the prepared-statement cache for every query in this module.
+    # IMMEDIATE takes the write lock at BEGIN, so a transaction never fails
+    # with SQLITE_BUSY halfway through upgrading from a read lock.
+    conn = sqlite3.connect(
+        str(DB_PATH), check_same_thread=False, cached_statements=256,
+        isolation_level="IMMEDIATE",
+    )
+    conn.row_factory = sqlite3.Row
+    # synchronous=NORMAL is crash-safe under WAL and skips the fsync per commit.
+    conn.executescript("""
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+    """)
+    _apply_cache_pragmas(conn)
+    return conn
+
+
+def _get_reader_connection() -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        DB_PATH.as_uri() + "?mode=ro", uri=True,
+        check_same_thread=False, cached_statements=256,
+    )
     conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
+    _apply_cache_pragmas(conn)
     return conn
 
 
+def _apply_cache_pragmas(conn: sqlite3.Connection) -> None:
+    # Page cache (KiB) and mmap window (bytes) can be lowered on small hosts.
+    cache_kb = int(os.environ.get("DB_CACHE_SIZE_KB", "64000"))
+    mmap_size = int(os.environ.get("DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+    conn.executescript(f"""
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-{cache_kb};
+        PRAGMA mmap_size={mmap_size};
+    """)
+
+
 def _init_db(conn: sqlite3.Connection) -> None:
     conn.executescript("""
         CREATE TABLE IF NOT EXISTS sessions (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TEXT NOT NULL,
+            timestamp TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now')),
             mode TEXT NOT NULL,
             overall_band REAL DEFAULT 0.0,
-            attempt_count INTEGER DEFAULT 0
+            attempt_count INTEGER DEFAULT 0,
+            band_total REAL DEFAULT 0.0
         );
 
         CREATE TABLE IF NOT EXISTS attempts (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             session_id INTEGER NOT NULL,
-            timestamp TEXT NOT NULL,
+            timestamp TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now')),
             part INTEGER DEFAULT 0,
             topic TEXT DEFAULT '',
             question_text TEXT DEFAULT '',
@@ -148,7 +264,7 @@ def _init_db(conn: sqlite3.Connection) -> None:
         CREATE TABLE IF NOT EXISTS writing_attempts (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             session_id INTEGER NOT NULL,
-            timestamp TEXT NOT NULL,
+            timestamp TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now')),
             prompt_id INTEGER NOT NULL,
             task_type INTEGER NOT NULL,
             essay_text TEXT NOT NULL,
@@ -170,26 +286,124 @@ def _init_db(conn: sqlite3.Connection) -> None:
         );
     """)
 
-    # FTS5 full-text search over page text (separate statement — virtual tables
-    # cannot be created inside executescript on some SQLite builds)
-    conn.execute("""
-        CREATE VIRTUAL TABLE IF NOT EXISTS document_pages_fts
-        USING fts5(text, doc_id UNINDEXED, page_no UNINDEXED,
-                   content='document_pages', content_rowid='id')
-    """)
+    _init_fts(conn)
 
     # Migrate existing databases: add new columns if missing
-    _new_columns = [
+    _add_missing_columns(conn, "attempts", [
         ("band9_answer", "TEXT DEFAULT ''"),
         ("strengths", "TEXT DEFAULT ''"),
         ("pronunciation_warnings", "TEXT DEFAULT ''"),
         ("source", "TEXT DEFAULT ''"),
-    ]
-    for col_name, col_type in _new_columns:
-        try:
-            conn.execute(f"ALTER TABLE attempts ADD COLUMN {col_name} {col_type}")
-        except sqlite3.OperationalError:
-            pass  # Column already exists
+    ])
+
+    # Running band sum lets _update_session_stats skip the COUNT/AVG rescan;
+    # backfill it once for sessions recorded before the column existed.
+    if _add_missing_columns(conn, "sessions", [("band_total", "REAL DEFAULT 0.0")]):
+        with conn:
+            conn.execute(
+                "UPDATE sessions SET band_total = COALESCE("
+                "(SELECT SUM(overall_band) FROM attempts WHERE session_id = sessions.id), 0.0)"
+            )
+
+    # Covering index for the trend/weak-area reads (index-only scans on the
+    # score columns), per-session lookups for speaking and writing attempts,
+    # and (part, question_text) for the one-variant-per-question window.
+    indexes = {
+        "idx_attempts_band": """attempts(
+            id DESC, timestamp, overall_band, fluency_coherence,
+            lexical_resource, grammatical_range, pronunciation
+        )""",
+        "idx_attempts_session_id": "attempts(session_id, id)",
+        "idx_writing_attempts_session_id": "writing_attempts(session_id, id)",
+        "idx_questions_part_text": "questions(part, question_text)",
+    }
+    existing = {
+        r["name"] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    }
+    missing = [name for name in indexes if name not in existing]
+    for name in missing:
+        conn.execute(f"CREATE INDEX {name} ON {indexes[name]}")
+    if missing:
+        conn.execute("ANALYZE")
+
+
+def _init_fts(conn: sqlite3.Connection) -> None:
+    """FTS5 index over page text, kept in sync with document_pages by triggers.
+
+    prefix='2 3 4' adds prefix indexes so ``term*`` queries are index lookups.
+    Tables created before the prefix option (and before the triggers, when
+    ingest_pdf.py wrote the index by hand) are dropped and rebuilt from
+    document_pages.
+    """
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'document_pages_fts'"
+    ).fetchone()
+    if row and "prefix" in row["sql"]:
+        return
+    # Separate statements — virtual tables cannot be created inside
+    # executescript on some SQLite builds
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        if row:
+            conn.execute("DROP TABLE document_pages_fts")
+        conn.execute("""
+            CREATE VIRTUAL TABLE document_pages_fts
+            USING fts5(text, doc_id UNINDEXED, page_no UNINDEXED,
+                       content='document_pages', content_rowid='id',
+                       prefix='2 3 4')
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS document_pages_ai AFTER INSERT ON document_pages
+            BEGIN
+                INSERT INTO document_pages_fts (rowid, text, doc_id, page_no)
+                VALUES (new.id, new.text, new.doc_id, new.page_no);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS document_pages_ad AFTER DELETE ON document_pages
+            BEGIN
+                INSERT INTO document_pages_fts (document_pages_fts, rowid, text, doc_id, page_no)
+                VALUES ('delete', old.id, old.text, old.doc_id, old.page_no);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS document_pages_au AFTER UPDATE ON document_pages
+            BEGIN
+                INSERT INTO document_pages_fts (document_pages_fts, rowid, text, doc_id, page_no)
+                VALUES ('delete', old.id, old.text, old.doc_id, old.page_no);
+                INSERT INTO document_pages_fts (rowid, text, doc_id, page_no)
+                VALUES (new.id, new.text, new.doc_id, new.page_no);
+            END
+        """)
+        conn.execute(
+            "INSERT INTO document_pages_fts (document_pages_fts) VALUES ('rebuild')"
+        )
+
+
+def optimize_fts() -> None:
+    """Merge the FTS index b-trees into one; run after a bulk ingest."""
+    conn = get_db()
+    with conn:
+        conn.execute(
+            "INSERT INTO document_pages_fts (document_pages_fts) VALUES ('optimize')"
+        )
+
+
+def _add_missing_columns(
+    conn: sqlite3.Connection, table: str, columns: list[tuple[str, str]],
+) -> list[str]:
+    """ALTER in whichever (name, type) columns the table lacks, in one transaction.
+
+    Returns the names that were added.
+    """
+    existing = {r["name"] for r in conn.execute(f"PRAGMA table_info({table})")}
+    missing = [(name, col_type) for name, col_type in columns if name not in existing]
+    if missing:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for name, col_type in missing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {col_type}")
+    return [name for name, _ in missing]
 
 
 def _seed_questions(conn: sqlite3.Connection) -> None:
@@ -202,182 +416,256 @@ def _seed_questions(conn: sqlite3.Connection) -> None:
         return
 
     with open(CSV_PATH, encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
-        rows = []
-        for r in reader:
-            rows.append((
-                int(r["part"]),
-                r.get("topic", "").strip(),
-                r["question"].strip(),
-                r.get("cue_card", "").strip(),
-                r.get("source", "").strip(),
-                r.get("band9_answer", "").strip(),
-                r.get("answer_variant", "").strip(),
-            ))
-
-    conn.executemany(
-        "INSERT INTO questions (part, topic, question_text, cue_card, source, "
-        "band9_answer, answer_variant) VALUES (?, ?, ?, ?, ?, ?, ?)",
-        rows,
-    )
-    conn.commit()
+        reader = csv.reader(f)
+        header = {name: i for i, name in enumerate(next(reader, []))}
+        # Optional columns map to None and come out as "".
+        idx = [header.get("topic"), header["question"]] + [
+            header.get(c) for c in ("cue_card", "source", "band9_answer", "answer_variant")
+        ]
+        part_idx = header["part"]
+        rows = (
+            (int(r[part_idx]),) + tuple(
+                r[i].strip() if i is not None and i < len(r) else "" for i in idx
+            )
+            for r in reader if r
+        )
+
+        # Rows stream from the CSV into one explicit transaction. The seed can
+        # simply be rerun after a crash, so skip the fsyncs while it runs.
+        conn.execute("PRAGMA synchronous=OFF")
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(_INSERT_QUESTION_SQL, rows)
+        finally:
+            conn.execute("PRAGMA synchronous=NORMAL")
+    # Fresh planner statistics for the now-populated questions table
+    conn.execute("ANALYZE")
 
 
 _conn: sqlite3.Connection | None = None
 
+# Idle read-only connections. Under WAL, readers never block the writer (or
+# each other), so dashboard queries don't queue behind save_attempt.
+_READER_POOL_SIZE = 4
+_readers: queue.SimpleQueue[sqlite3.Connection] = queue.SimpleQueue()
+
 
 def get_db() -> sqlite3.Connection:
+    """The shared writer connection (creates and seeds the schema on first use)."""
     global _conn
     if _conn is None:
         _conn = _get_connection()
         _init_db(_conn)
         _seed_questions(_conn)
+        atexit.register(_close_db)
     return _conn
 
 
+def _close_db() -> None:
+    """Refresh planner statistics where needed, then close all connections."""
+    global _conn
+    while not _readers.empty():
+        _readers.get_nowait().close()
+    if _conn is not None:
+        try:
+            # Cheap: only re-analyzes tables whose queries would benefit
+            _conn.execute("PRAGMA optimize")
+        except sqlite3.Error:
+            logger.debug("PRAGMA optimize failed", exc_info=True)
+        _conn.close()
+        _conn = None
+
+
+@contextmanager
+def get_reader() -> Iterator[sqlite3.Connection]:
+    """Borrow a read-only connection from the pool for SELECT-only work."""
+    get_db()  # the schema must exist before a mode=ro connection can open it
+    try:
+        conn = _readers.get_nowait()
+    except queue.Empty:
+        conn = _get_reader_connection()
+    try:
+        yield conn
+    finally:
+        if _readers.qsize() < _READER_POOL_SIZE:
+            _readers.put(conn)
+        else:
+            conn.close()
+
+
 # ---------------------------------------------------------------------------
 # Question loading from DB
 # ---------------------------------------------------------------------------
 
+# One random answer variant per (part, question_text), picked in SQL. The
+# statement stays prepared, but results are not memoized: every call re-rolls.
+_RANDOM_VARIANTS_SQL = (
+    "SELECT part, topic, question_text, cue_card, source, band9_answer FROM ("
+    "  SELECT *, ROW_NUMBER() OVER ("
+    "    PARTITION BY part, question_text ORDER BY RANDOM()) AS rn"
+    "  FROM questions"
+    ") WHERE rn = 1 ORDER BY part, question_text"
+)
+
+
 def get_all_questions_from_db() -> list[dict]:
     """Load all unique questions from the DB, one random answer variant per question.
 
     Returns list of dicts with keys: part, topic, question_text, cue_card, source,
     band9_answer.
     """
-    conn = get_db()
-    # Get all distinct (part, question_text) groups with their answers
-    rows = conn.execute(
-        "SELECT part, topic, question_text, cue_card, source, band9_answer, answer_variant "
-        "FROM questions ORDER BY part, question_text, answer_variant"
-    ).fetchall()
-
-    # Group by (part, question_text), pick one random variant per question
-    import random
-    groups: dict[tuple[int, str], list[dict]] = {}
-    for r in rows:
-        key = (r["part"], r["question_text"])
-        if key not in groups:
-            groups[key] = []
-        groups[key].append(dict(r))
-
-    result = []
-    for (_part, _text), variants in groups.items():
-        chosen = random.choice(variants)
-        result.append({
-            "part": chosen["part"],
-            "topic": chosen["topic"],
-            "question_text": chosen["question_text"],
-            "cue_card": chosen["cue_card"],
-            "source": chosen["source"],
-            "band9_answer": chosen["band9_answer"],
-        })
-    return result
+    with get_reader() as conn:
+        rows = conn.execute(_RANDOM_VARIANTS_SQL).fetchall()
+    return [dict(r) for r in rows]
 
 
 def create_session(mode: str) -> int:
     conn = get_db()
-    ts = datetime.now(timezone.utc).isoformat()
-    cursor = conn.execute(
-        "INSERT INTO sessions (timestamp, mode) VALUES (?, ?)",
-        (ts, mode),
-    )
-    conn.commit()
+    with conn:
+        cursor = conn.execute(_INSERT_SESSION_SQL, (None, mode))
     return cursor.lastrowid
 
 
 def save_attempt(record: AttemptRecord) -> int:
+    return save_attempts([record])[0]
+
+
+def save_attempts(records: list[AttemptRecord]) -> list[int]:
+    """Insert attempts and fold them into their sessions in one transaction.
+
+    Session aggregates get one UPDATE per session rather than per attempt.
+    Returns the new attempt ids in input order.
+    """
     conn = get_db()
-    if not record.timestamp:
-        record.timestamp = datetime.now(timezone.utc).isoformat()
-    cursor = conn.execute(
-        """INSERT INTO attempts (
-            session_id, timestamp, part, topic, question_text, transcript,
-            duration, overall_band, fluency_coherence, lexical_resource,
-            grammatical_range, pronunciation, speech_rate, pause_ratio,
-            pronunciation_confidence, examiner_feedback,
-            grammar_corrections, vocabulary_upgrades, improvement_tips,
-            band9_answer, strengths, pronunciation_warnings, source
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        (
-            record.session_id,
-            record.timestamp,
-            record.part,
-            record.topic,
-            record.question_text,
-            record.transcript,
-            record.duration,
-            record.overall_band,
-            record.fluency_coherence,
-            record.lexical_resource,
-            record.grammatical_range,
-            record.pronunciation,
-            record.speech_rate,
-            record.pause_ratio,
-            record.pronunciation_confidence,
-            record.examiner_feedback,
-            record.grammar_corrections,
-            record.vocabulary_upgrades,
-            record.improvement_tips,
-            record.band9_answer,
-            record.strengths,
-            record.pronunciation_warnings,
-            record.source,
-        ),
+    ids = []
+    per_session: dict[int, list[float]] = {}  # session_id -> [count, band sum]
+    with conn:
+        for record in records:
+            cursor = conn.execute(_INSERT_ATTEMPT_SQL, _attempt_params(record))
+            ids.append(_inserted_id(cursor))
+            acc = per_session.setdefault(record.session_id, [0, 0.0])
+            acc[0] += 1
+            acc[1] += record.overall_band
+        for session_id, (count, total) in per_session.items():
+            _update_session_stats(session_id, total, count)
+    return ids
+
+
+def dump_json(value) -> str:
+    """Compact JSON text for the feedback columns.
+
+    Stays TEXT (not a binary encoding) so the weakness queries can keep using
+    json_each; no whitespace or \\u escapes keeps rows small and quick to parse.
+    """
+    if orjson:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _attempt_params(record: AttemptRecord) -> tuple:
+    return (
+        record.session_id,
+        record.timestamp or None,
+        record.part,
+        record.topic,
+        record.question_text,
+        record.transcript,
+        record.duration,
+        record.overall_band,
+        record.fluency_coherence,
+        record.lexical_resource,
+        record.grammatical_range,
+        record.pronunciation,
+        record.speech_rate,
+        record.pause_ratio,
+        record.pronunciation_confidence,
+        record.examiner_feedback,
+        record.grammar_corrections,
+        record.vocabulary_upgrades,
+        record.improvement_tips,
+        record.band9_answer,
+        record.strengths,
+        record.pronunciation_warnings,
+        record.source,
     )
-    conn.commit()
 
-    # Update session aggregates
-    _update_session_stats(record.session_id)
-    return cursor.lastrowid
 
+def _update_session_stats(session_id: int, band_total: float, count: int = 1) -> None:
+    """Fold ``count`` new attempts (bands summing to ``band_total``) into a session.
 
-def _update_session_stats(session_id: int) -> None:
+    Runs inside the caller's transaction. The mean is kept as a running sum so
+    no rescan of the attempts table is needed; it is rounded to the nearest half band.
+    """
     conn = get_db()
-    row = conn.execute(
-        "SELECT COUNT(*) as cnt, AVG(overall_band) as avg_band "
-        "FROM attempts WHERE session_id = ?",
-        (session_id,),
-    ).fetchone()
-    if row:
-        conn.execute(
-            "UPDATE sessions SET attempt_count = ?, overall_band = ? WHERE id = ?",
-            (row["cnt"], round(row["avg_band"] * 2) / 2, session_id),
-        )
-        conn.commit()
+    cursor = conn.execute(
+        _UPDATE_SESSION_STATS_SQL, {"count": count, "total": band_total, "id": session_id},
+    )
+    if _HAS_RETURNING:
+        row = cursor.fetchone()
+        if row:
+            logger.debug(
+                "Session %d stats: attempts=%d, band=%.1f",
+                session_id, row["attempt_count"], row["overall_band"],
+            )
+
+
+def _inserted_id(cursor: sqlite3.Cursor) -> int:
+    """Id of the row just inserted by one of the ``_RETURNING_ID`` statements."""
+    if _HAS_RETURNING:
+        return cursor.fetchone()[0]
+    return cursor.lastrowid
 
 
-def get_band_trend(limit: int = 50) -> list[dict]:
-    conn = get_db()
-    rows = conn.execute(
-        "SELECT timestamp, overall_band FROM attempts "
-        "ORDER BY id DESC LIMIT ?",
-        (limit,),
-    ).fetchall()
-    return [dict(r) for r in reversed(rows)]
+def get_band_trend(limit: int = 50) -> list[sqlite3.Row]:
+    with get_reader() as conn:
+        rows = conn.execute(
+            "SELECT timestamp, overall_band FROM attempts "
+            "ORDER BY id DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+    rows.reverse()  # oldest first
+    return rows
 
 
-def get_criterion_trends(limit: int = 50) -> list[dict]:
-    conn = get_db()
-    rows = conn.execute(
-        "SELECT timestamp, fluency_coherence, lexical_resource, "
-        "grammatical_range, pronunciation FROM attempts "
-        "ORDER BY id DESC LIMIT ?",
-        (limit,),
-    ).fetchall()
-    return [dict(r) for r in reversed(rows)]
+def get_criterion_trends(limit: int = 50) -> list[sqlite3.Row]:
+    with get_reader() as conn:
+        rows = conn.execute(
+            "SELECT timestamp, fluency_coherence, lexical_resource, "
+            "grammatical_range, pronunciation FROM attempts "
+            "ORDER BY id DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+    rows.reverse()  # oldest first
+    return rows
 
 
 def get_weak_areas() -> dict[str, float]:
-    conn = get_db()
-    row = conn.execute(
-        "SELECT "
-        "AVG(fluency_coherence) as fluency_coherence, "
-        "AVG(lexical_resource) as lexical_resource, "
-        "AVG(grammatical_range) as grammatical_range, "
-        "AVG(pronunciation) as pronunciation "
-        "FROM (SELECT * FROM attempts ORDER BY id DESC LIMIT 20)",
-    ).fetchone()
+    return _weak_areas(_latest_id("attempts"))
+
+
+def _latest_id(table: str) -> int:
+    """MAX(id) of an append-only table — a single B-tree seek.
+
+    Memoized dashboard reads key on it: ids come from AUTOINCREMENT and are
+    never reused, so any new row (from this process or another) changes it.
+    """
+    with get_reader() as conn:
+        return conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0] or 0
+
+
+@functools.lru_cache(maxsize=8)
+def _weak_areas(_latest: int) -> dict[str, float]:
+    with get_reader() as conn:
+        row = conn.execute(
+            "SELECT "
+            "AVG(fluency_coherence) as fluency_coherence, "
+            "AVG(lexical_resource) as lexical_resource, "
+            "AVG(grammatical_range) as grammatical_range, "
+            "AVG(pronunciation) as pronunciation "
+            "FROM (SELECT fluency_coherence, lexical_resource, grammatical_range, "
+            "pronunciation FROM attempts ORDER BY id DESC LIMIT 20)",
+        ).fetchone()
     if not row or row["fluency_coherence"] is None:
         return {}
     return {
@@ -388,129 +676,185 @@ def get_weak_areas() -> dict[str, float]:
     }
 
 
-def get_recent_sessions(limit: int = 20) -> list[dict]:
-    conn = get_db()
-    rows = conn.execute(
-        "SELECT * FROM sessions ORDER BY id DESC LIMIT ?",
-        (limit,),
-    ).fetchall()
-    return [dict(r) for r in rows]
+def get_trends_bundle(limit: int = 50) -> dict:
+    """Band trend, criterion trends and weak areas from one scan of attempts.
 
+    Returns {"trend": rows oldest first with timestamp, overall_band and the four
+    criteria (at most ``limit``), "weak_areas": same shape as get_weak_areas()}.
+    """
+    with get_reader() as conn:
+        rows = conn.execute(
+            "SELECT timestamp, overall_band, fluency_coherence, lexical_resource, "
+            "grammatical_range, pronunciation FROM attempts "
+            "ORDER BY id DESC LIMIT ?",
+            (max(limit, 20),),
+        ).fetchall()
 
-def get_attempts_for_session(session_id: int) -> list[dict]:
-    conn = get_db()
-    rows = conn.execute(
-        "SELECT * FROM attempts WHERE session_id = ? ORDER BY id",
-        (session_id,),
-    ).fetchall()
-    result = []
-    for r in rows:
-        d = dict(r)
-        # Parse JSON fields
-        for field in (
-            "grammar_corrections", "vocabulary_upgrades", "improvement_tips",
-            "strengths", "pronunciation_warnings",
-        ):
-            val = d.get(field, "")
-            if val:
-                try:
-                    d[field] = json.loads(val)
-                except (json.JSONDecodeError, TypeError):
-                    pass
-        result.append(d)
-    return result
+    # Weak areas average the latest 20 attempts, like get_weak_areas
+    weak_areas = {}
+    recent = rows[:20]
+    for label, col in _SPEAKING_CRITERIA.items():
+        vals = [r[col] for r in recent if r[col] is not None]
+        if not vals:
+            weak_areas = {}
+            break
+        weak_areas[label] = round(sum(vals) / len(vals), 1)
 
+    trend = rows[:limit]
+    trend.reverse()  # oldest first
+    return {"trend": trend, "weak_areas": weak_areas}
 
-def get_detailed_weaknesses(limit: int = 50) -> dict:
-    """Aggregate weakness data from recent attempts (no LLM calls).
 
-    Returns a dict with:
-    - grammar_errors: list of (original, corrected, count) tuples — most frequent
-    - basic_words: list of (word, count) tuples — most common words to upgrade
-    - criterion_trends: dict of criterion -> {"avg": float, "direction": str}
-    - recurring_tips: list of (tip, count) tuples — most repeated tips
+def get_recent_sessions(limit: int = 20) -> list[sqlite3.Row]:
+    with get_reader() as conn:
+        rows = conn.execute(
+            "SELECT id, timestamp, mode, overall_band, attempt_count FROM sessions "
+            "ORDER BY id DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+    return rows
+
+
+_ATTEMPT_COLUMNS = (
+    "id", "session_id", "timestamp", "part", "topic", "question_text", "transcript",
+    "duration", "overall_band", "fluency_coherence", "lexical_resource",
+    "grammatical_range", "pronunciation", "speech_rate", "pause_ratio",
+    "pronunciation_confidence", "examiner_feedback", "grammar_corrections",
+    "vocabulary_upgrades", "improvement_tips", "band9_answer", "strengths",
+    "pronunciation_warnings", "source",
+)
+# List view: everything except the large free-text columns
+_ATTEMPT_LIST_COLUMNS = tuple(
+    c for c in _ATTEMPT_COLUMNS
+    if c not in ("transcript", "examiner_feedback", "band9_answer")
+)
+
+
+_JSON_FIELDS = (
+    "grammar_corrections", "vocabulary_upgrades", "improvement_tips",
+    "strengths", "pronunciation_warnings",
+)
+_WRITING_JSON_FIELDS = (
+    "paragraph_feedback", "grammar_corrections", "vocabulary_upgrades",
+    "improvement_tips",
+)
+
+
+def _iter_json_rows(
+    sql: str, params: tuple, json_fields: tuple[str, ...],
+) -> Iterator[dict]:
+    """Stream query rows as dicts, parsing the JSON text columns (left as-is if invalid).
+
+    Rows are fetched in batches of 256 as plain tuples and keyed by position.
+    The reader connection is held until the iterator is exhausted or closed.
     """
-    conn = get_db()
-    rows = conn.execute(
-        "SELECT grammar_corrections, vocabulary_upgrades, improvement_tips, "
-        "fluency_coherence, lexical_resource, grammatical_range, pronunciation, "
-        "id FROM attempts ORDER BY id DESC LIMIT ?",
-        (limit,),
-    ).fetchall()
-
-    if not rows:
-        return {}
+    with get_reader() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(sql, params)
+        names = [d[0] for d in cursor.description]
+        json_idx = [i for i, name in enumerate(names) if name in json_fields]
+        while batch := cursor.fetchmany(256):
+            for row in batch:
+                values = list(row)
+                for i in json_idx:
+                    val = values[i]
+                    if val:
+                        try:
+                            values[i] = _json_loads(val)
+                        except (ValueError, TypeError):  # incl. json/orjson JSONDecodeError
+                            pass
+                yield dict(zip(names, values))
+
+
+def get_attempts_for_session(
+    session_id: int, columns: tuple[str, ...] | None = None,
+) -> Iterator[dict]:
+    """Attempts of a session, oldest first, with JSON fields decoded (streamed).
+
+    ``columns`` selects the projection; by default the transcript, examiner
+    feedback and band 9 answer are left out (see ``get_attempt_detail``).
+    """
+    columns = columns or _ATTEMPT_LIST_COLUMNS
+    unknown = set(columns).difference(_ATTEMPT_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown attempt columns: {sorted(unknown)}")
+    return _iter_json_rows(
+        f"SELECT {', '.join(columns)} FROM attempts WHERE session_id = ? ORDER BY id",
+        (session_id,), _JSON_FIELDS,
+    )
+
+
+def get_attempt_detail(attempt_id: int) -> dict | None:
+    """Full attempt row (all columns), with JSON fields decoded."""
+    rows = list(_iter_json_rows(
+        "SELECT * FROM attempts WHERE id = ?", (attempt_id,), _JSON_FIELDS,
+    ))
+    return rows[0] if rows else None
+
+
+_SPEAKING_CRITERIA = {
+    "Fluency & Coherence": "fluency_coherence",
+    "Lexical Resource": "lexical_resource",
+    "Grammar": "grammatical_range",
+    "Pronunciation": "pronunciation",
+}
+
 
-    # Parse grammar errors
-    from collections import Counter
-    grammar_counter: Counter = Counter()
-    for r in rows:
-        gc_raw = r["grammar_corrections"] or ""
-        if gc_raw:
-            try:
-                corrections = json.loads(gc_raw) if isinstance(gc_raw, str) else gc_raw
-                if isinstance(corrections, list):
-                    for item in corrections:
-                        if isinstance(item, dict):
-                            orig = item.get("original", "").strip()
-                            corr = item.get("corrected", "").strip()
-                            if orig and corr:
-                                grammar_counter[(orig, corr)] += 1
-            except (json.JSONDecodeError, TypeError):
-                pass
-
-    # Parse basic words to upgrade
-    word_counter: Counter = Counter()
-    for r in rows:
-        vu_raw = r["vocabulary_upgrades"] or ""
-        if vu_raw:
-            try:
-                upgrades = json.loads(vu_raw) if isinstance(vu_raw, str) else vu_raw
-                if isinstance(upgrades, list):
-                    for item in upgrades:
-                        if isinstance(item, dict):
-                            word = item.get("basic_word", "").strip().lower()
-                            if word:
-                                word_counter[word] += 1
-            except (json.JSONDecodeError, TypeError):
-                pass
-
-    # Parse recurring tips
-    tip_counter: Counter = Counter()
-    for r in rows:
-        tips_raw = r["improvement_tips"] or ""
-        if tips_raw:
-            try:
-                tips = json.loads(tips_raw) if isinstance(tips_raw, str) else tips_raw
-                if isinstance(tips, list):
-                    for tip in tips:
-                        if isinstance(tip, str) and tip.strip():
-                            tip_counter[tip.strip()] += 1
-            except (json.JSONDecodeError, TypeError):
-                pass
-
-    # Criterion trends — compare first half vs second half of attempts
-    criteria = {
-        "Fluency & Coherence": "fluency_coherence",
-        "Lexical Resource": "lexical_resource",
-        "Grammar": "grammatical_range",
-        "Pronunciation": "pronunciation",
+def _trend_halves_sql(table: str, columns: list[str]) -> str:
+    """Per-column averages over the latest N rows: overall, older half, newer half.
+
+    Only positive scores count. With n rows the older half is the n // 2
+    oldest, i.e. ROW_NUMBER() (newest = 1) greater than n - n / 2.
+    """
+    aggregates = ", ".join(
+        f"AVG({c}) FILTER (WHERE {c} > 0) AS {c}_avg, "
+        f"AVG({c}) FILTER (WHERE {c} > 0 AND rn > n - n / 2) AS {c}_old, "
+        f"AVG({c}) FILTER (WHERE {c} > 0 AND rn <= n - n / 2) AS {c}_new"
+        for c in columns
+    )
+    return (
+        f"SELECT COUNT(*) AS n, {aggregates} FROM ("
+        f"SELECT {', '.join(columns)}, ROW_NUMBER() OVER (ORDER BY id DESC) AS rn, "
+        f"COUNT(*) OVER () AS n "
+        f"FROM (SELECT id, {', '.join(columns)} FROM {table} ORDER BY id DESC LIMIT ?))"
+    )
+
+
+_SPEAKING_TREND_SQL = _trend_halves_sql("attempts", list(_SPEAKING_CRITERIA.values()))
+
+
+def _top_feedback_items(conn: sqlite3.Connection, table: str, limit: int) -> dict:
+    """Top-5 grammar errors, basic words and tips over the latest ``limit`` rows."""
+    return {
+        key: [dict(r) for r in conn.execute(sql.format(table=table), (limit,))]
+        for key, sql in (
+            ("grammar_errors", _TOP_GRAMMAR_ERRORS_SQL),
+            ("basic_words", _TOP_BASIC_WORDS_SQL),
+            ("recurring_tips", _TOP_TIPS_SQL),
+        )
     }
-    criterion_trends = {}
-    rows_list = list(reversed(rows))  # oldest first
-    mid = len(rows_list) // 2
+
+
+def _criterion_trends(
+    conn: sqlite3.Connection, sql: str, criteria: dict[str, str], limit: int,
+) -> tuple[int, dict]:
+    """Row count and {label: {"avg", "direction"}} from a _trend_halves_sql query.
+
+    Direction compares the newer half of the window against the older half.
+    """
+    row = conn.execute(sql, (limit,)).fetchone()
+    n = row["n"]
+    mid = n // 2
+    trends = {}
     for label, col in criteria.items():
-        all_vals = [r[col] for r in rows_list if r[col] is not None and r[col] > 0]
-        if not all_vals:
+        avg = row[f"{col}_avg"]
+        if avg is None:
             continue
-        avg = round(sum(all_vals) / len(all_vals), 1)
-        if mid > 0 and len(rows_list) >= 4:
-            first_half = [r[col] for r in rows_list[:mid] if r[col] and r[col] > 0]
-            second_half = [r[col] for r in rows_list[mid:] if r[col] and r[col] > 0]
-            if first_half and second_half:
-                avg1 = sum(first_half) / len(first_half)
-                avg2 = sum(second_half) / len(second_half)
-                diff = avg2 - avg1
+        if mid > 0 and n >= 4:
+            old, new = row[f"{col}_old"], row[f"{col}_new"]
+            if old is not None and new is not None:
+                diff = new - old
                 if diff > 0.3:
                     direction = "improving"
                 elif diff < -0.3:
@@ -521,22 +865,38 @@ def get_detailed_weaknesses(limit: int = 50) -> dict:
                 direction = "insufficient data"
         else:
             direction = "insufficient data"
-        criterion_trends[label] = {"avg": avg, "direction": direction}
+        trends[label] = {"avg": round(avg, 1), "direction": direction}
+    return n, trends
+
+
+def get_detailed_weaknesses(limit: int = 50) -> dict:
+    """Aggregate weakness data from recent attempts (no LLM calls).
+
+    Returns a dict with:
+    - grammar_errors: list of (original, corrected, count) tuples — most frequent
+    - basic_words: list of (word, count) tuples — most common words to upgrade
+    - criterion_trends: dict of criterion -> {"avg": float, "direction": str}
+    - recurring_tips: list of (tip, count) tuples — most repeated tips
 
+    Memoized until a new attempt is saved; treat the result as read-only.
+    """
+    return _detailed_weaknesses(limit, _latest_id("attempts"))
+
+
+@functools.lru_cache(maxsize=8)
+def _detailed_weaknesses(limit: int, _latest: int) -> dict:
+    with get_reader() as conn:
+        n, criterion_trends = _criterion_trends(
+            conn, _SPEAKING_TREND_SQL, _SPEAKING_CRITERIA, limit,
+        )
+        if not n:
+            return {}
+        feedback = _top_feedback_items(conn, "attempts", limit)
     return {
-        "grammar_errors": [
-            {"original": k[0], "corrected": k[1], "count": v}
-            for k, v in grammar_counter.most_common(5)
-        ],
-        "basic_words": [
-            {"word": k, "count": v}
-            for k, v in word_counter.most_common(5)
-        ],
+        "grammar_errors": feedback["grammar_errors"],
+        "basic_words": feedback["basic_words"],
         "criterion_trends": criterion_trends,
-        "recurring_tips": [
-            {"tip": k, "count": v}
-            for k, v in tip_counter.most_common(5)
-        ],
+        "recurring_tips": feedback["recurring_tips"],
     }
 
 
@@ -552,253 +912,176 @@ def save_writing_attempt(session_id: int, attempt_data: dict) -> int:
         attempt_data.get("overall_band", 0), attempt_data.get("word_count", 0),
     )
     conn = get_db()
-    ts = attempt_data.get("timestamp") or datetime.now(timezone.utc).isoformat()
-    cursor = conn.execute(
-        """INSERT INTO writing_attempts (
-            session_id, timestamp, prompt_id, task_type, essay_text, word_count,
-            task_score, coherence_score, lexical_score, grammar_score, overall_band,
-            examiner_feedback, paragraph_feedback, grammar_corrections,
-            vocabulary_upgrades, improvement_tips, provider, raw_json
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        (
-            session_id,
-            ts,
-            attempt_data["prompt_id"],
-            attempt_data["task_type"],
-            attempt_data["essay_text"],
-            attempt_data["word_count"],
-            attempt_data["task_score"],
-            attempt_data["coherence_score"],
-            attempt_data["lexical_score"],
-            attempt_data["grammar_score"],
-            attempt_data["overall_band"],
-            attempt_data.get("examiner_feedback", ""),
-            attempt_data.get("paragraph_feedback", ""),
-            attempt_data.get("grammar_corrections", ""),
-            attempt_data.get("vocabulary_upgrades", ""),
-            attempt_data.get("improvement_tips", ""),
-            attempt_data.get("provider", ""),
-            attempt_data.get("raw_json", ""),
-        ),
-    )
-    conn.commit()
-    _update_session_stats(session_id)
-    return cursor.lastrowid
+    ts = attempt_data.get("timestamp") or None
+    # Insert + session stats share one transaction, so one commit per save
+    with conn:
+        cursor = conn.execute(
+            _INSERT_WRITING_ATTEMPT_SQL,
+            (
+                session_id,
+                ts,
+                attempt_data["prompt_id"],
+                attempt_data["task_type"],
+                attempt_data["essay_text"],
+                attempt_data["word_count"],
+                attempt_data["task_score"],
+                attempt_data["coherence_score"],
+                attempt_data["lexical_score"],
+                attempt_data["grammar_score"],
+                attempt_data["overall_band"],
+                attempt_data.get("examiner_feedback", ""),
+                attempt_data.get("paragraph_feedback", ""),
+                attempt_data.get("grammar_corrections", ""),
+                attempt_data.get("vocabulary_upgrades", ""),
+                attempt_data.get("improvement_tips", ""),
+                attempt_data.get("provider", ""),
+                attempt_data.get("raw_json", ""),
+            ),
+        )
+        attempt_id = _inserted_id(cursor)
+        _update_session_stats(session_id, attempt_data["overall_band"])
+    return attempt_id
 
 
-def get_writing_attempts(session_id: int | None = None) -> list[dict]:
-    """Query writing attempts, optionally filtered by session."""
-    conn = get_db()
+def get_writing_attempts(session_id: int | None = None, limit: int = 100) -> Iterator[dict]:
+    """Stream writing attempts: a session's in order, or the latest ``limit`` overall."""
     if session_id is not None:
-        rows = conn.execute(
+        return _iter_json_rows(
             "SELECT * FROM writing_attempts WHERE session_id = ? ORDER BY id",
-            (session_id,),
-        ).fetchall()
-    else:
-        rows = conn.execute(
-            "SELECT * FROM writing_attempts ORDER BY id DESC LIMIT 100"
-        ).fetchall()
-    result = []
-    for r in rows:
-        d = dict(r)
-        for field in ("paragraph_feedback", "grammar_corrections",
-                       "vocabulary_upgrades", "improvement_tips"):
-            val = d.get(field, "")
-            if val:
-                try:
-                    d[field] = json.loads(val)
-                except (json.JSONDecodeError, TypeError):
-                    pass
-        result.append(d)
-    return result
+            (session_id,), _WRITING_JSON_FIELDS,
+        )
+    return _iter_json_rows(
+        "SELECT * FROM writing_attempts ORDER BY id DESC LIMIT ?",
+        (limit,), _WRITING_JSON_FIELDS,
+    )
 
 
 def get_all_writing_prompts() -> list[dict]:
     """Return all prompts from the writing_prompts table."""
-    conn = get_db()
-    rows = conn.execute(
-        "SELECT wp.*, da.file_path AS chart_image_path "
-        "FROM writing_prompts wp "
-        "LEFT JOIN document_assets da ON wp.chart_asset_id = da.id "
-        "ORDER BY wp.id"
-    ).fetchall()
+    with get_reader() as conn:
+        rows = conn.execute(
+            "SELECT wp.*, da.file_path AS chart_image_path "
+            "FROM writing_prompts wp "
+            "LEFT JOIN document_assets da ON wp.chart_asset_id = da.id "
+            "ORDER BY wp.id"
+        ).fetchall()
     return [dict(r) for r in rows]
 
 
 def get_writing_prompt_by_id(prompt_id: int) -> dict | None:
     """Single prompt lookup with resolved chart image path."""
-    conn = get_db()
-    row = conn.execute(
-        "SELECT wp.*, da.file_path AS chart_image_path "
-        "FROM writing_prompts wp "
-        "LEFT JOIN document_assets da ON wp.chart_asset_id = da.id "
-        "WHERE wp.id = ?",
-        (prompt_id,),
-    ).fetchone()
+    with get_reader() as conn:
+        row = conn.execute(
+            "SELECT wp.*, da.file_path AS chart_image_path "
+            "FROM writing_prompts wp "
+            "LEFT JOIN document_assets da ON wp.chart_asset_id = da.id "
+            "WHERE wp.id = ?",
+            (prompt_id,),
+        ).fetchone()
     return dict(row) if row else None
 
 
-def search_document_pages(query: str, limit: int = 20) -> list[dict]:
-    """FTS5 search over ingested document pages with snippets."""
+def search_document_pages(
+    query: str, limit: int = 20, max_rank: float | None = None,
+) -> list[dict]:
+    """FTS5 search over ingested document pages with snippets.
+
+    ``max_rank`` drops weak hits before their snippets are built: bm25 scores
+    are negative and lower is better, so e.g. -1.0 keeps only stronger matches.
+    """
     logger.debug("FTS search: query=%r, limit=%d", query, limit)
-    conn = get_db()
-    rows = conn.execute(
+    sql = (
         "SELECT dp.doc_id, dp.page_no, d.file_name, "
-        "snippet(document_pages_fts, 0, '<b>', '</b>', '...', 40) AS snippet "
+        "snippet(document_pages_fts, 0, '<b>', '</b>', '...', 16) AS snippet "
         "FROM document_pages_fts fts "
         "JOIN document_pages dp ON dp.id = fts.rowid "
         "JOIN documents d ON d.id = dp.doc_id "
         "WHERE document_pages_fts MATCH ? "
-        "ORDER BY rank LIMIT ?",
-        (query, limit),
-    ).fetchall()
+    )
+    params: tuple = (query,)
+    if max_rank is not None:
+        sql += "AND fts.rank <= ? "
+        params += (max_rank,)
+    with get_reader() as conn:
+        rows = conn.execute(sql + "ORDER BY rank LIMIT ?", params + (limit,)).fetchall()
     return [dict(r) for r in rows]
 
 
 def get_document_list() -> list[dict]:
     """List all ingested documents."""
-    conn = get_db()
-    rows = conn.execute(
-        "SELECT * FROM documents ORDER BY ingested_at DESC"
-    ).fetchall()
+    with get_reader() as conn:
+        rows = conn.execute(
+            "SELECT * FROM documents ORDER BY ingested_at DESC"
+        ).fetchall()
     return [dict(r) for r in rows]
 
 
 def get_document_page_assets(doc_id: int, page_no: int) -> list[dict]:
     """Get image assets for a specific document page."""
-    conn = get_db()
-    rows = conn.execute(
-        "SELECT * FROM document_assets "
-        "WHERE doc_id = ? AND page_no = ? ORDER BY id",
-        (doc_id, page_no),
-    ).fetchall()
+    with get_reader() as conn:
+        rows = conn.execute(
+            "SELECT * FROM document_assets "
+            "WHERE doc_id = ? AND page_no = ? ORDER BY id",
+            (doc_id, page_no),
+        ).fetchall()
     return [dict(r) for r in rows]
 
 
 def get_writing_samples(prompt_id: int) -> list[dict]:
     """Get model/sample answers for a writing prompt."""
-    conn = get_db()
-    rows = conn.execute(
-        "SELECT * FROM writing_samples WHERE prompt_id = ? ORDER BY band DESC",
-        (prompt_id,),
-    ).fetchall()
+    with get_reader() as conn:
+        rows = conn.execute(
+            "SELECT * FROM writing_samples WHERE prompt_id = ? ORDER BY band DESC",
+            (prompt_id,),
+        ).fetchall()
     return [dict(r) for r in rows]
 
 
-def get_writing_criterion_trends(limit: int = 50) -> list[dict]:
+def get_writing_criterion_trends(limit: int = 50) -> list[sqlite3.Row]:
     """Writing band trends over time (4 criteria + overall)."""
-    conn = get_db()
-    rows = conn.execute(
-        "SELECT timestamp, task_score, coherence_score, lexical_score, "
-        "grammar_score, overall_band FROM writing_attempts "
-        "ORDER BY id DESC LIMIT ?",
-        (limit,),
-    ).fetchall()
-    return [dict(r) for r in reversed(rows)]
+    with get_reader() as conn:
+        rows = conn.execute(
+            "SELECT timestamp, task_score, coherence_score, lexical_score, "
+            "grammar_score, overall_band FROM writing_attempts "
+            "ORDER BY id DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+    rows.reverse()  # oldest first
+    return rows
+
+
+_WRITING_CRITERIA = {
+    "Task Achievement": "task_score",
+    "Coherence & Cohesion": "coherence_score",
+    "Lexical Resource": "lexical_score",
+    "Grammar": "grammar_score",
+}
+_WRITING_TREND_SQL = _trend_halves_sql(
+    "writing_attempts", list(_WRITING_CRITERIA.values()),
+)
 
 
 def get_writing_weaknesses() -> dict:
-    """Aggregate writing weakness analysis from recent attempts."""
-    conn = get_db()
-    rows = conn.execute(
-        "SELECT grammar_corrections, vocabulary_upgrades, improvement_tips, "
-        "task_score, coherence_score, lexical_score, grammar_score, id "
-        "FROM writing_attempts ORDER BY id DESC LIMIT 50"
-    ).fetchall()
+    """Aggregate writing weakness analysis from recent attempts.
 
-    if not rows:
-        return {}
+    Memoized until a new writing attempt is saved; treat the result as read-only.
+    """
+    return _writing_weaknesses(_latest_id("writing_attempts"))
 
-    from collections import Counter
-
-    grammar_counter: Counter = Counter()
-    word_counter: Counter = Counter()
-    tip_counter: Counter = Counter()
-
-    for r in rows:
-        gc_raw = r["grammar_corrections"] or ""
-        if gc_raw:
-            try:
-                corrections = json.loads(gc_raw) if isinstance(gc_raw, str) else gc_raw
-                if isinstance(corrections, list):
-                    for item in corrections:
-                        if isinstance(item, dict):
-                            orig = item.get("original", "").strip()
-                            corr = item.get("corrected", "").strip()
-                            if orig and corr:
-                                grammar_counter[(orig, corr)] += 1
-            except (json.JSONDecodeError, TypeError):
-                pass
-
-        vu_raw = r["vocabulary_upgrades"] or ""
-        if vu_raw:
-            try:
-                upgrades = json.loads(vu_raw) if isinstance(vu_raw, str) else vu_raw
-                if isinstance(upgrades, list):
-                    for item in upgrades:
-                        if isinstance(item, dict):
-                            word = item.get("basic_word", "").strip().lower()
-                            if word:
-                                word_counter[word] += 1
-            except (json.JSONDecodeError, TypeError):
-                pass
-
-        tips_raw = r["improvement_tips"] or ""
-        if tips_raw:
-            try:
-                tips = json.loads(tips_raw) if isinstance(tips_raw, str) else tips_raw
-                if isinstance(tips, list):
-                    for tip in tips:
-                        if isinstance(tip, str) and tip.strip():
-                            tip_counter[tip.strip()] += 1
-            except (json.JSONDecodeError, TypeError):
-                pass
-
-    criteria = {
-        "Task Achievement": "task_score",
-        "Coherence & Cohesion": "coherence_score",
-        "Lexical Resource": "lexical_score",
-        "Grammar": "grammar_score",
-    }
-    criterion_trends = {}
-    rows_list = list(reversed(rows))
-    mid = len(rows_list) // 2
-    for label, col in criteria.items():
-        all_vals = [r[col] for r in rows_list if r[col] is not None and r[col] > 0]
-        if not all_vals:
-            continue
-        avg = round(sum(all_vals) / len(all_vals), 1)
-        if mid > 0 and len(rows_list) >= 4:
-            first_half = [r[col] for r in rows_list[:mid] if r[col] and r[col] > 0]
-            second_half = [r[col] for r in rows_list[mid:] if r[col] and r[col] > 0]
-            if first_half and second_half:
-                avg1 = sum(first_half) / len(first_half)
-                avg2 = sum(second_half) / len(second_half)
-                diff = avg2 - avg1
-                if diff > 0.3:
-                    direction = "improving"
-                elif diff < -0.3:
-                    direction = "declining"
-                else:
-                    direction = "stable"
-            else:
-                direction = "insufficient data"
-        else:
-            direction = "insufficient data"
-        criterion_trends[label] = {"avg": avg, "direction": direction}
+
+@functools.lru_cache(maxsize=4)
+def _writing_weaknesses(_latest: int) -> dict:
+    with get_reader() as conn:
+        n, criterion_trends = _criterion_trends(
+            conn, _WRITING_TREND_SQL, _WRITING_CRITERIA, 50,
+        )
+        if not n:
+            return {}
+        feedback = _top_feedback_items(conn, "writing_attempts", 50)
 
     return {
-        "grammar_errors": [
-            {"original": k[0], "corrected": k[1], "count": v}
-            for k, v in grammar_counter.most_common(5)
-        ],
-        "basic_words": [
-            {"word": k, "count": v}
-            for k, v in word_counter.most_common(5)
-        ],
+        "grammar_errors": feedback["grammar_errors"],
+        "basic_words": feedback["basic_words"],
         "criterion_trends": criterion_trends,
-        "recurring_tips": [
-            {"tip": k, "count": v}
-            for k, v in tip_counter.most_common(5)
-        ],
+        "recurring_tips": feedback["recurring_tips"],
     }
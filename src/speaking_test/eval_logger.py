@@ -3,14 +3,28 @@
 Writes one JSON file per evaluation into a date/time-ordered folder hierarchy:
 
     logs/evaluations/YYYY-MM-DD/HHMMSS_mode/eval_NNN.json
+
+Files are written by a background thread; call flush_eval_log() to wait for
+pending writes (it also runs at interpreter exit).
 """
 
 from __future__ import annotations
 
+import atexit
+import itertools
 import json
 import logging
 import os
-from datetime import datetime, timezone
+import queue
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+try:
+    import orjson  # optional, faster JSON encoding
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
@@ -19,11 +33,30 @@ _BASE_DIR = os.path.join(
     os.path.dirname(os.path.abspath(__file__)), "..", "..", "logs", "evaluations"
 )
 
-# session_id -> folder path
-_session_dirs: dict[int, str] = {}
 
-# session_id -> next eval sequence number
-_session_counters: dict[int, int] = {}
+@dataclass(slots=True)
+class _Sess:
+    path_prefix: str  # "<session folder>/eval_", joined once at init
+    # Eval sequence numbers; next() is atomic, unlike a read-modify-write
+    counter: Iterator[int] = field(default_factory=lambda: itertools.count(1))
+
+
+# session_id -> registered session
+_sessions: dict[int, _Sess] = {}
+
+# Date folders already created by this process
+_dates_created: set[str] = set()
+
+# (filepath, payload) pairs waiting for the writer thread
+_write_queue: queue.Queue[tuple[str, bytes]] = queue.Queue()
+_writer: threading.Thread | None = None
+_writer_lock = threading.Lock()
+
+# O_BINARY/O_CLOEXEC only exist on Windows/POSIX respectively
+_OPEN_FLAGS = (
+    os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+    | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0)
+)
 
 
 def init_eval_session(session_id: int, mode: str) -> str:
@@ -31,42 +64,99 @@ def init_eval_session(session_id: int, mode: str) -> str:
 
     Returns the absolute path to the session folder.
     """
-    now = datetime.now(timezone.utc)
-    date_str = now.strftime("%Y-%m-%d")
-    time_str = now.strftime("%H%M%S")
+    now = time.gmtime()  # UTC
+    date_str = time.strftime("%Y-%m-%d", now)
+    time_str = time.strftime("%H%M%S", now)
     folder_name = f"{time_str}_{mode}"
 
-    session_dir = os.path.join(_BASE_DIR, date_str, folder_name)
-    os.makedirs(session_dir, exist_ok=True)
-
-    _session_dirs[session_id] = session_dir
-    _session_counters[session_id] = 1
+    date_dir = os.path.join(_BASE_DIR, date_str)
+    if date_str not in _dates_created:
+        os.makedirs(date_dir, exist_ok=True)
+        _dates_created.add(date_str)
+    session_dir = os.path.join(date_dir, folder_name)
+    try:
+        os.mkdir(session_dir)
+    except FileExistsError:
+        pass  # same second and mode as an earlier session
+    except FileNotFoundError:
+        # Date folder removed while we were running
+        os.makedirs(session_dir, exist_ok=True)
+
+    _sessions[session_id] = _Sess(os.path.join(session_dir, "eval_"))
 
     logger.info("Eval session %d initialized: %s", session_id, session_dir)
     return session_dir
 
 
 def log_evaluation(session_id: int, data: dict) -> str | None:
-    """Write the next sequentially numbered eval JSON into the session folder.
+    """Queue the next sequentially numbered eval JSON for the session folder.
 
-    Returns the file path written, or None if the session was not initialized.
+    The data is serialized here; the file itself is written in the background.
+    Returns the file path, or None if the session was not initialized.
     """
-    session_dir = _session_dirs.get(session_id)
-    if session_dir is None:
+    sess = _sessions.get(session_id)
+    if sess is None:
         logger.warning(
             "log_evaluation called for uninitialized session %d — skipping",
             session_id,
         )
         return None
 
-    seq = _session_counters.get(session_id, 1)
-    filename = f"eval_{seq:03d}.json"
-    filepath = os.path.join(session_dir, filename)
+    filepath = f"{sess.path_prefix}{next(sess.counter):03d}.json"
 
-    _session_counters[session_id] = seq + 1
+    # Encode up front and hand the file one buffer: json.dump would stream
+    # the indented document to the file in many small writes.
+    _write_queue.put((filepath, _dumps(data)))
+    _ensure_writer()
+    return filepath
 
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
 
-    logger.info("Eval logged: %s", filepath)
-    return filepath
+def flush_eval_log() -> None:
+    """Block until every queued eval log has been written."""
+    _write_queue.join()
+
+
+def _ensure_writer() -> None:
+    global _writer
+    if _writer is not None:
+        return
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(
+                target=_writer_loop, name="eval-log-writer", daemon=True,
+            )
+            _writer.start()
+            atexit.register(flush_eval_log)
+
+
+def _writer_loop() -> None:
+    while True:
+        filepath, payload = _write_queue.get()
+        try:
+            _write_file(filepath, payload)
+            logger.info("Eval logged: %s", filepath)
+        except OSError:
+            logger.exception("Failed to write eval log %s", filepath)
+        finally:
+            _write_queue.task_done()
+
+
+def _dumps(data: dict) -> bytes:
+    """Indented UTF-8 JSON, via orjson when it is installed."""
+    if orjson:
+        return orjson.dumps(
+            data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _write_file(filepath: str, payload: bytes) -> None:
+    """Write bytes straight to a raw fd — no text or buffering layers."""
+    fd = os.open(filepath, _OPEN_FLAGS, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
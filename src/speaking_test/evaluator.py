@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 import time
+from collections.abc import Callable, Mapping
+from contextvars import ContextVar
+from types import MappingProxyType
 
+from speaking_test import gemini_evaluator
 from speaking_test.gemini_evaluator import (
     compute_combined_band,
     compute_writing_band,
@@ -20,10 +25,12 @@ from speaking_test.models import (
 
 __all__ = [
     "get_provider",
+    "reset_provider_cache",
     "get_last_eval_meta",
     "is_provider_configured",
     "evaluate_answer",
     "evaluate_answer_enhanced",
+    "evaluate_answers_batch",
     "compute_combined_band",
     "detect_fillers",
     "evaluate_writing",
@@ -33,26 +40,59 @@ __all__ = [
 ]
 
 # Metadata from the most recent evaluation call (provider, model, timing).
-_last_eval_meta: dict = {}
+# Context-local, so concurrent sessions (threads or tasks) each see their own.
+_last_eval_meta: ContextVar[dict] = ContextVar("_last_eval_meta", default={})
 
 
-def get_last_eval_meta() -> dict:
-    """Return metadata captured from the last evaluation call."""
-    return dict(_last_eval_meta)
+def get_last_eval_meta() -> Mapping:
+    """Return metadata captured from the last evaluation call in this context.
+
+    A read-only view: each call stores a fresh dict, so nothing is copied.
+    """
+    return MappingProxyType(_last_eval_meta.get())
+
+
+_provider: str | None = None
 
 
 def get_provider() -> str:
-    """Return the configured evaluation provider ('gemini' or 'ollama')."""
-    return os.environ.get("PROVIDER", "gemini").lower()
+    """Return the configured evaluation provider ('gemini' or 'ollama').
+
+    Read from PROVIDER once; call reset_provider_cache() after changing it.
+    """
+    global _provider
+    if _provider is None:
+        _provider = os.environ.get("PROVIDER", "gemini").lower()
+    return _provider
+
+
+def reset_provider_cache() -> None:
+    """Forget the cached provider so the next call re-reads PROVIDER."""
+    global _provider
+    _provider = None
+
+
+_ollama_module = None
+
+
+def _ollama():
+    """The ollama_evaluator module, imported on first use.
+
+    Gemini-only setups never load it (or httpx).
+    """
+    global _ollama_module
+    if _ollama_module is None:
+        from speaking_test import ollama_evaluator
+
+        _ollama_module = ollama_evaluator
+    return _ollama_module
 
 
 def is_provider_configured() -> bool:
     """Check whether the active provider is ready to use."""
     provider = get_provider()
     if provider == "ollama":
-        from speaking_test.ollama_evaluator import is_available
-
-        return is_available()
+        return _ollama().is_available()
     # Default: gemini
     return bool(os.environ.get("GEMINI_API_KEY"))
 
@@ -62,37 +102,35 @@ def evaluate_answer(
     part: int,
     transcript: str,
     band9_answer: str = "",
+    progress_cb: Callable[[int], None] | None = None,
 ) -> ContentEvaluation:
-    """Dispatch evaluation to the configured provider."""
-    global _last_eval_meta
+    """Dispatch evaluation to the configured provider.
+
+    progress_cb (streamed chunk count) is only called by the Gemini provider.
+    """
     provider = get_provider()
     t0 = time.perf_counter()
 
     if provider == "ollama":
-        from speaking_test import ollama_evaluator
-
+        ollama_evaluator = _ollama()
         result = ollama_evaluator.evaluate_answer(question, part, transcript, band9_answer)
-        _last_eval_meta = {
+        _last_eval_meta.set({
             "provider": "ollama",
             "model_name": ollama_evaluator._OLLAMA_MODEL,
             "response_time_ms": round((time.perf_counter() - t0) * 1000),
-        }
+        })
         return result
 
-    from speaking_test.gemini_evaluator import (
-        create_gemini_client,
-        evaluate_answer as gemini_evaluate,
-        get_model_name,
+    client = gemini_evaluator.create_gemini_client()
+    model = gemini_evaluator.get_model_name()
+    result = gemini_evaluator.evaluate_answer(
+        client, model, question, part, transcript, band9_answer, progress_cb
     )
-
-    client = create_gemini_client()
-    model = get_model_name()
-    result = gemini_evaluate(client, model, question, part, transcript, band9_answer)
-    _last_eval_meta = {
+    _last_eval_meta.set({
         "provider": "gemini",
-        "model_name": model,
+        "model_name": gemini_evaluator.last_response_model() or model,
         "response_time_ms": round((time.perf_counter() - t0) * 1000),
-    }
+    })
     return result
 
 
@@ -101,42 +139,76 @@ def evaluate_answer_enhanced(
     part: int,
     transcript: str,
     band9_answer: str = "",
+    progress_cb: Callable[[int], None] | None = None,
 ) -> EnhancedReview:
-    """Dispatch enhanced evaluation to the configured provider."""
-    global _last_eval_meta
+    """Dispatch enhanced evaluation to the configured provider.
+
+    progress_cb (streamed chunk count) is only called by the Gemini provider.
+    """
     provider = get_provider()
     t0 = time.perf_counter()
 
     if provider == "ollama":
-        from speaking_test import ollama_evaluator
-
+        ollama_evaluator = _ollama()
         result = ollama_evaluator.evaluate_answer_enhanced(
             question, part, transcript, band9_answer
         )
-        _last_eval_meta = {
+        _last_eval_meta.set({
             "provider": "ollama",
             "model_name": ollama_evaluator._OLLAMA_MODEL,
             "response_time_ms": round((time.perf_counter() - t0) * 1000),
-        }
+        })
         return result
 
-    from speaking_test.gemini_evaluator import (
-        create_gemini_client,
-        evaluate_answer_enhanced as gemini_evaluate_enhanced,
-        get_model_name,
+    client = gemini_evaluator.create_gemini_client()
+    model = gemini_evaluator.get_model_name()
+    result = gemini_evaluator.evaluate_answer_enhanced(
+        client, model, question, part, transcript, band9_answer, progress_cb
     )
-
-    client = create_gemini_client()
-    model = get_model_name()
-    result = gemini_evaluate_enhanced(client, model, question, part, transcript, band9_answer)
-    _last_eval_meta = {
+    _last_eval_meta.set({
         "provider": "gemini",
-        "model_name": model,
+        "model_name": gemini_evaluator.last_response_model() or model,
         "response_time_ms": round((time.perf_counter() - t0) * 1000),
-    }
+    })
     return result
 
 
+async def evaluate_answers_batch(
+    items: list[dict],
+    enhanced: bool = False,
+) -> list[ContentEvaluation | EnhancedReview | BaseException]:
+    """Evaluate several answers concurrently.
+
+    Each item holds evaluate_answer's keyword arguments; enhanced=True gives
+    EnhancedReview results (e.g. scoring a whole mock test at once). Gemini
+    calls go through the async client; Ollama calls run in worker threads. At
+    most EVAL_CONCURRENCY (default 8) are in flight at a time. Results come
+    back in input order; a failed item yields its exception instead of raising.
+    """
+    sem = asyncio.Semaphore(int(os.environ.get("EVAL_CONCURRENCY", "8")))
+    if get_provider() == "ollama":
+        evaluate = evaluate_answer_enhanced if enhanced else evaluate_answer
+
+        async def call(item: dict) -> ContentEvaluation | EnhancedReview:
+            return await asyncio.to_thread(evaluate, **item)
+    else:
+        client = gemini_evaluator.create_gemini_client()
+        model = gemini_evaluator.get_model_name()
+        aevaluate = (
+            gemini_evaluator.aevaluate_answer_enhanced if enhanced
+            else gemini_evaluator.aevaluate_answer
+        )
+
+        async def call(item: dict) -> ContentEvaluation | EnhancedReview:
+            return await aevaluate(client, model, **item)
+
+    async def run(item: dict) -> ContentEvaluation | EnhancedReview:
+        async with sem:
+            return await call(item)
+
+    return await asyncio.gather(*(run(item) for item in items), return_exceptions=True)
+
+
 # ---------------------------------------------------------------------------
 # Writing evaluation facade
 # ---------------------------------------------------------------------------
@@ -148,39 +220,31 @@ def evaluate_writing(
     task1_data_json: str | None = None,
 ) -> WritingEvaluation:
     """Dispatch writing evaluation to the configured provider."""
-    global _last_eval_meta
     provider = get_provider()
     t0 = time.perf_counter()
 
     if provider == "ollama":
-        from speaking_test import ollama_evaluator
-
+        ollama_evaluator = _ollama()
         result = ollama_evaluator.evaluate_writing(
             prompt_text, essay_text, task_type, task1_data_json
         )
-        _last_eval_meta = {
+        _last_eval_meta.set({
             "provider": "ollama",
             "model_name": ollama_evaluator._OLLAMA_MODEL,
             "response_time_ms": round((time.perf_counter() - t0) * 1000),
-        }
+        })
         return result
 
-    from speaking_test.gemini_evaluator import (
-        create_gemini_client,
-        evaluate_writing as gemini_evaluate_writing,
-        get_model_name,
-    )
-
-    client = create_gemini_client()
-    model = get_model_name()
-    result = gemini_evaluate_writing(
+    client = gemini_evaluator.create_gemini_client()
+    model = gemini_evaluator.get_model_name()
+    result = gemini_evaluator.evaluate_writing(
         client, model, prompt_text, essay_text, task_type, task1_data_json
     )
-    _last_eval_meta = {
+    _last_eval_meta.set({
         "provider": "gemini",
-        "model_name": model,
+        "model_name": gemini_evaluator.last_response_model() or model,
         "response_time_ms": round((time.perf_counter() - t0) * 1000),
-    }
+    })
     return result
 
 
@@ -191,37 +255,29 @@ def evaluate_writing_enhanced(
     task1_data_json: str | None = None,
 ) -> WritingEnhancedReview:
     """Dispatch enhanced writing evaluation to the configured provider."""
-    global _last_eval_meta
     provider = get_provider()
     t0 = time.perf_counter()
 
     if provider == "ollama":
-        from speaking_test import ollama_evaluator
-
+        ollama_evaluator = _ollama()
         result = ollama_evaluator.evaluate_writing_enhanced(
             prompt_text, essay_text, task_type, task1_data_json
         )
-        _last_eval_meta = {
+        _last_eval_meta.set({
             "provider": "ollama",
             "model_name": ollama_evaluator._OLLAMA_MODEL,
             "response_time_ms": round((time.perf_counter() - t0) * 1000),
-        }
+        })
         return result
 
-    from speaking_test.gemini_evaluator import (
-        create_gemini_client,
-        evaluate_writing_enhanced as gemini_evaluate_writing_enhanced,
-        get_model_name,
-    )
-
-    client = create_gemini_client()
-    model = get_model_name()
-    result = gemini_evaluate_writing_enhanced(
+    client = gemini_evaluator.create_gemini_client()
+    model = gemini_evaluator.get_model_name()
+    result = gemini_evaluator.evaluate_writing_enhanced(
         client, model, prompt_text, essay_text, task_type, task1_data_json
     )
-    _last_eval_meta = {
+    _last_eval_meta.set({
         "provider": "gemini",
-        "model_name": model,
+        "model_name": gemini_evaluator.last_response_model() or model,
         "response_time_ms": round((time.perf_counter() - t0) * 1000),
-    }
+    })
     return result
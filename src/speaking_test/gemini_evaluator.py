@@ -2,11 +2,22 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
 import logging
 import os
 import re
-
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Callable
+from contextvars import ContextVar
+
+import httpx
+import numpy as np
 from google import genai
+from google.genai import errors as genai_errors
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +25,7 @@ from speaking_test.models import (
     CriterionScore,
     EnhancedReview,
     ContentEvaluation,
+    MockTestState,
     WritingEvaluation,
     WritingEnhancedReview,
 )
@@ -56,15 +68,6 @@ Score each criterion on the IELTS 0-9 band scale (use 0.5 increments). Be fair b
 rigorous. Base your scores entirely on what the candidate said, not on how closely \
 it matches any reference answer. Any reference answer provided is ONLY for understanding \
 the question's expected scope — ignore its wording, structure, and vocabulary when scoring.
-
-Return your evaluation as a JSON object with this exact structure:
-{
-  "coherence": {"score": <float>, "feedback": "<string>"},
-  "lexical_resource": {"score": <float>, "feedback": "<string>"},
-  "grammatical_range": {"score": <float>, "feedback": "<string>"},
-  "task_response": {"score": <float>, "feedback": "<string>"},
-  "overall_feedback": "<string>"
-}
 """
 
 ENHANCED_SYSTEM_PROMPT = """\
@@ -120,20 +123,98 @@ good language use. Be specific, not generic.
 
 5. **Improvement priorities**: Reference specific moments in the transcript where \
 the candidate could improve. Give actionable rewrites.
+"""
+
+# Rubric skeletons of the two prompts above (IELTS_PROMPT_MODE=lite): one line
+# per criterion, same rules on quoting and reference answers.
+SYSTEM_PROMPT_LITE = """\
+You are an IELTS speaking examiner. Score the candidate's transcript on its own \
+merits against the IELTS band descriptors; do NOT assess pronunciation or fluency. \
+Quote the candidate's actual words in feedback and never invent errors.
+
+- Coherence: logical flow, signposting, fully developed ideas.
+- Lexical Resource: precise, idiomatic vocabulary and collocations.
+- Grammatical Range: range and accuracy of structures.
+- Task Response: directly answers the question with reasons and examples.
+
+Use the 0-9 band scale in 0.5 steps. Any reference answer only shows the \
+question's scope — never score against it.
+"""
 
-Return a JSON object matching the schema provided.
+ENHANCED_SYSTEM_PROMPT_LITE = SYSTEM_PROMPT_LITE + """
+Also provide, quoting the transcript:
+1. Grammar corrections: exact erroneous phrase, correction, brief rule.
+2. Vocabulary upgrades: basic words actually used, 2-3 alternatives with an example.
+3. Pronunciation warnings: commonly mispronounced words, with stress/IPA tips.
+4. Strengths: specific well-used phrases.
+5. Improvement priorities: specific moments with actionable rewrites.
 """
 
 
+def _speaking_system_prompt(enhanced: bool) -> str:
+    """Speaking system prompt for IELTS_PROMPT_MODE (full by default, or lite)."""
+    if os.environ.get("IELTS_PROMPT_MODE", "full").lower() == "lite":
+        return ENHANCED_SYSTEM_PROMPT_LITE if enhanced else SYSTEM_PROMPT_LITE
+    return ENHANCED_SYSTEM_PROMPT if enhanced else SYSTEM_PROMPT
+
+
 def create_gemini_client() -> genai.Client:
-    """Create a Gemini client using the API key from environment."""
+    """Return the Gemini client for the API key in the environment.
+
+    Clients are shared per key, so their HTTP connection pool stays warm
+    across evaluations.
+    """
     api_key = os.environ.get("GEMINI_API_KEY", "")
     if not api_key:
         raise ValueError(
             "GEMINI_API_KEY not found in environment. "
             "Add it to your .env file: GEMINI_API_KEY=your-key-here"
         )
-    return genai.Client(api_key=api_key)
+    return _client_for_key(api_key)
+
+
+# Pool sized for evaluate_answers_batch fan-out (EVAL_CONCURRENCY). Transient
+# 429/5xx responses are retried by the SDK; with a per-attempt deadline and a
+# short backoff cap, a failing call gives up in well under two minutes instead
+# of hanging. Callers should not wrap evaluations in their own retry loops.
+# Older google-genai releases lack the pool and retry fields, so each is only
+# set when HttpOptions has it (the SDK defaults apply otherwise).
+_HTTP_OPTION_FIELDS = genai.types.HttpOptions.model_fields
+
+
+def _http_options() -> genai.types.HttpOptions:
+    # Built with each client rather than at import, so GEMINI_TIMEOUT_MS from
+    # a .env loaded after this module is imported still applies.
+    kwargs: dict = {"timeout": int(os.environ.get("GEMINI_TIMEOUT_MS", "20000"))}
+    for name in ("client_args", "async_client_args"):
+        if name in _HTTP_OPTION_FIELDS:
+            kwargs[name] = {
+                "limits": httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            }
+    if "retry_options" in _HTTP_OPTION_FIELDS:
+        kwargs["retry_options"] = genai.types.HttpRetryOptions(
+            attempts=3,
+            initial_delay=0.5,
+            max_delay=4.0,
+            http_status_codes=[408, 429, 500, 502, 503, 504],
+        )
+    return genai.types.HttpOptions(**kwargs)
+
+# Served instead when the configured model's quota is exhausted (429 after retries).
+_FALLBACK_MODEL = "gemini-2.5-flash-lite"
+
+# Model that produced the last response in this context (sync or async).
+_answered_by: ContextVar[str] = ContextVar("_answered_by", default="")
+
+
+def last_response_model() -> str:
+    """Model behind the last evaluation in this context: _FALLBACK_MODEL after a quota fallback."""
+    return _answered_by.get()
+
+
+@functools.lru_cache(maxsize=4)
+def _client_for_key(api_key: str) -> genai.Client:
+    return genai.Client(api_key=api_key, http_options=_http_options())
 
 
 def get_model_name() -> str:
@@ -141,19 +222,27 @@ def get_model_name() -> str:
     return os.environ.get("GEMINI_MODEL", "gemini-2.5-flash-lite")
 
 
-# ---------------------------------------------------------------------------
-# Standard evaluation (unchanged)
-# ---------------------------------------------------------------------------
+def _clip_transcript(transcript: str) -> str:
+    """Keep the tail of transcripts over GEMINI_MAX_TRANSCRIPT_TOKENS (~4 chars/token).
 
-def evaluate_answer(
-    client: genai.Client,
-    model: str,
-    question: str,
-    part: int,
-    transcript: str,
-    band9_answer: str = "",
-) -> ContentEvaluation:
-    """Send a candidate's transcript for IELTS content evaluation via Gemini."""
+    The end of a long answer says the most about sustained fluency, and the
+    cap keeps runaway transcriptions from inflating cost and latency.
+    """
+    max_chars = int(os.environ.get("GEMINI_MAX_TRANSCRIPT_TOKENS", "3000")) * 4
+    if len(transcript) <= max_chars:
+        return transcript
+    tail = transcript[-max_chars:]
+    tail = tail[tail.find(" ") + 1:]  # don't start mid-word
+    logger.warning(
+        "Transcript of ~%d tokens clipped to its last ~%d",
+        len(transcript) // 4, len(tail) // 4,
+    )
+    return "[... earlier part of the answer omitted ...] " + tail
+
+
+def _speaking_prompt(question: str, part: int, transcript: str, band9_answer: str = "") -> str:
+    """User prompt for one spoken answer."""
+    transcript = _clip_transcript(transcript)
     user_prompt = f"""## IELTS Speaking Part {part}
 
 **Question:** {question}
@@ -166,21 +255,238 @@ def evaluate_answer(
 **Reference Answer (for question scope only — do NOT compare or score against this):**
 {band9_answer}
 """
+    return user_prompt
 
-    logger.info("Gemini evaluate_answer: part=%d, transcript_len=%d", part, len(transcript))
-    response = client.models.generate_content(
-        model=model,
-        contents=user_prompt,
-        config=genai.types.GenerateContentConfig(
-            system_instruction=SYSTEM_PROMPT,
-            temperature=0.3,
-            response_mime_type="application/json",
-            response_schema=ContentEvaluation,
-        ),
+
+def _writing_prompt(
+    prompt_text: str,
+    essay_text: str,
+    task_type: int,
+    task1_data_json: str | None = None,
+) -> tuple[str, int]:
+    """User prompt for one essay, plus its word count."""
+    task_label = "Task 1" if task_type == 1 else "Task 2"
+    min_words = 150 if task_type == 1 else 250
+    word_count = len(essay_text.split())
+
+    user_prompt = f"""## IELTS Writing {task_label}
+
+**Question/Prompt:**
+{prompt_text}
+
+**Candidate's Essay ({word_count} words, minimum {min_words}):**
+{essay_text}
+"""
+    if task1_data_json:
+        user_prompt += f"\n**Chart Data (JSON):**\n{task1_data_json}\n"
+    return user_prompt, word_count
+
+
+# Older google-genai releases only take response_schema (the SDK's own
+# conversion of the pydantic class); newer ones accept a plain JSON Schema.
+_HAS_JSON_SCHEMA = "response_json_schema" in genai.types.GenerateContentConfig.model_fields
+
+
+def _thinking_budget(model: str) -> int | None:
+    """IELTS_THINKING_BUDGET for model (default 0, thinking off); None keeps the model default.
+
+    Rubric scoring against a fixed schema gains little from thinking tokens.
+    Pro models cannot switch thinking off, so a 0 budget is not sent to them.
+    """
+    budget = int(os.environ.get("IELTS_THINKING_BUDGET", "0"))
+    if budget == 0 and "-pro" in model:
+        return None
+    return budget
+
+
+@functools.lru_cache(maxsize=None)
+def _config(
+    system_prompt: str, schema: type, thinking_budget: int | None = None,
+) -> genai.types.GenerateContentConfig:
+    """Request config per (prompt, schema, budget), built once and reused; treat as read-only."""
+    if _HAS_JSON_SCHEMA:
+        extra = {"response_json_schema": schema.model_json_schema()}
+    else:
+        extra = {"response_schema": schema}
+    if thinking_budget is not None:
+        extra["thinking_config"] = genai.types.ThinkingConfig(thinking_budget=thinking_budget)
+    return genai.types.GenerateContentConfig(
+        system_instruction=system_prompt,
+        temperature=0.3,
+        response_mime_type="application/json",
+        **extra,
     )
 
-    logger.debug("Gemini raw response: %s", response.text[:500])
-    return ContentEvaluation.model_validate_json(response.text)
+
+# Exact-match cache of raw response text: resubmitting the same answer (same
+# model, prompt and schema) skips the API round trip. Text, not parsed models,
+# so each hit hands out a fresh object.
+_RESPONSE_CACHE_SIZE = 256
+_response_cache: OrderedDict[str, str] = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+# Opt-in second tier on disk, so re-scoring the same transcripts survives
+# restarts: entries live for IELTS_EVAL_CACHE_TTL seconds (default 0 = off).
+_DISK_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "speaking_test", "evals")
+
+
+def _cache_key(model: str, user_prompt: str, system_prompt: str, schema: type) -> str:
+    raw = "\0".join((model, schema.__name__, system_prompt, user_prompt.strip()))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _cached_response(key: str) -> str | None:
+    with _response_cache_lock:
+        text = _response_cache.get(key)
+        if text is not None:
+            _response_cache.move_to_end(key)
+            return text
+
+    ttl = float(os.environ.get("IELTS_EVAL_CACHE_TTL", "0"))
+    if ttl <= 0:
+        return None
+    path = os.path.join(_DISK_CACHE_DIR, f"{key}.json")
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    except OSError:
+        return None
+    _remember_response(key, text)
+    return text
+
+
+def _remember_response(key: str, text: str) -> None:
+    with _response_cache_lock:
+        _response_cache[key] = text
+        if len(_response_cache) > _RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+
+def _store_on_disk(key: str, text: str) -> None:
+    """Write-then-rename, so readers never see a partial entry."""
+    try:
+        os.makedirs(_DISK_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=_DISK_CACHE_DIR, suffix=".tmp")
+    except OSError:
+        logger.warning("Could not create eval cache entry %s", key, exc_info=True)
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, os.path.join(_DISK_CACHE_DIR, f"{key}.json"))
+    except OSError:
+        logger.warning("Could not write eval cache entry %s", key, exc_info=True)
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def _parse_response(key: str, text: str, schema: type):
+    logger.debug("Gemini raw %s response: %s", schema.__name__, text[:500])
+    try:
+        result = schema.model_validate_json(text)  # only valid responses get cached
+    except ValueError:
+        logger.warning("Gemini returned invalid %s JSON: %s", schema.__name__, text[:200])
+        raise
+    _remember_response(key, text)
+    if float(os.environ.get("IELTS_EVAL_CACHE_TTL", "0")) > 0:
+        _store_on_disk(key, text)
+    return result
+
+
+def _generate(
+    client: genai.Client, model: str, user_prompt: str, system_prompt: str, schema: type,
+    progress_cb: Callable[[int], None] | None = None,
+):
+    """Run one request; with progress_cb, stream it and report the chunk count as it grows."""
+    _answered_by.set(model)
+    key = _cache_key(model, user_prompt, system_prompt, schema)
+    text = _cached_response(key)
+    if text is not None:
+        logger.info("Gemini %s served from response cache", schema.__name__)
+        return schema.model_validate_json(text)
+    config = _config(system_prompt, schema, _thinking_budget(model))
+    try:
+        text = _request_text(client, model, user_prompt, config, progress_cb)
+    except genai_errors.ClientError as e:
+        if e.code != 429 or model == _FALLBACK_MODEL:
+            raise
+        logger.warning("Gemini %s quota exhausted; falling back to %s", model, _FALLBACK_MODEL)
+        _answered_by.set(_FALLBACK_MODEL)
+        key = _cache_key(_FALLBACK_MODEL, user_prompt, system_prompt, schema)
+        text = _request_text(client, _FALLBACK_MODEL, user_prompt, config, progress_cb)
+    return _parse_response(key, text, schema)
+
+
+def _request_text(
+    client: genai.Client, model: str, user_prompt: str,
+    config: genai.types.GenerateContentConfig, progress_cb: Callable[[int], None] | None,
+) -> str:
+    if progress_cb is None:
+        response = client.models.generate_content(model=model, contents=user_prompt, config=config)
+        return response.text
+
+    chunks = []
+    for chunk in client.models.generate_content_stream(
+        model=model, contents=user_prompt, config=config,
+    ):
+        chunks.append(chunk.text or "")
+        progress_cb(len(chunks))
+    return "".join(chunks)
+
+
+async def _agenerate(
+    client: genai.Client, model: str, user_prompt: str, system_prompt: str, schema: type,
+):
+    _answered_by.set(model)
+    key = _cache_key(model, user_prompt, system_prompt, schema)
+    text = _cached_response(key)
+    if text is not None:
+        logger.info("Gemini %s served from response cache", schema.__name__)
+        return schema.model_validate_json(text)
+    config = _config(system_prompt, schema, _thinking_budget(model))
+    try:
+        response = await client.aio.models.generate_content(
+            model=model, contents=user_prompt, config=config,
+        )
+    except genai_errors.ClientError as e:
+        if e.code != 429 or model == _FALLBACK_MODEL:
+            raise
+        logger.warning("Gemini %s quota exhausted; falling back to %s", model, _FALLBACK_MODEL)
+        _answered_by.set(_FALLBACK_MODEL)
+        key = _cache_key(_FALLBACK_MODEL, user_prompt, system_prompt, schema)
+        response = await client.aio.models.generate_content(
+            model=_FALLBACK_MODEL, contents=user_prompt, config=config,
+        )
+    return _parse_response(key, response.text, schema)
+
+
+# ---------------------------------------------------------------------------
+# Standard evaluation (unchanged)
+# ---------------------------------------------------------------------------
+
+def evaluate_answer(
+    client: genai.Client,
+    model: str,
+    question: str,
+    part: int,
+    transcript: str,
+    band9_answer: str = "",
+    progress_cb: Callable[[int], None] | None = None,
+) -> ContentEvaluation:
+    """Send a candidate's transcript for IELTS content evaluation via Gemini.
+
+    Pass progress_cb to stream the response; it gets the chunk count so far.
+    """
+    user_prompt = _speaking_prompt(question, part, transcript, band9_answer)
+
+    logger.info("Gemini evaluate_answer: part=%d, transcript_len=%d", part, len(transcript))
+    return _generate(
+        client, model, user_prompt, _speaking_system_prompt(False), ContentEvaluation, progress_cb
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -194,36 +500,19 @@ def evaluate_answer_enhanced(
     part: int,
     transcript: str,
     band9_answer: str = "",
+    progress_cb: Callable[[int], None] | None = None,
 ) -> EnhancedReview:
-    """Evaluate with richer feedback: grammar corrections, vocab upgrades, etc."""
-    user_prompt = f"""## IELTS Speaking Part {part}
-
-**Question:** {question}
+    """Evaluate with richer feedback: grammar corrections, vocab upgrades, etc.
 
-**Candidate's Answer (transcribed from speech):**
-{transcript}
-"""
-    if band9_answer:
-        user_prompt += f"""
-**Reference Answer (for question scope only — do NOT compare or score against this):**
-{band9_answer}
-"""
+    Pass progress_cb to stream the response; it gets the chunk count so far.
+    """
+    user_prompt = _speaking_prompt(question, part, transcript, band9_answer)
 
     logger.info("Gemini evaluate_answer_enhanced: part=%d, transcript_len=%d", part, len(transcript))
-    response = client.models.generate_content(
-        model=model,
-        contents=user_prompt,
-        config=genai.types.GenerateContentConfig(
-            system_instruction=ENHANCED_SYSTEM_PROMPT,
-            temperature=0.3,
-            response_mime_type="application/json",
-            response_schema=EnhancedReview,
-        ),
+    return _generate(
+        client, model, user_prompt, _speaking_system_prompt(True), EnhancedReview, progress_cb
     )
 
-    logger.debug("Gemini enhanced raw response: %s", response.text[:500])
-    return EnhancedReview.model_validate_json(response.text)
-
 
 # ---------------------------------------------------------------------------
 # Combined band computation (unchanged)
@@ -274,17 +563,60 @@ def compute_combined_band(
     grammar = content_eval.grammatical_range.score
     pronunciation = pronunciation_band
 
-    # Overall band: equal 25% weight
-    raw = (fluency_coherence + lexical + grammar + pronunciation) / 4
-    overall = round(raw * 2) / 2  # Round to nearest 0.5
-    overall = max(4.0, min(9.0, overall))
+    # Overall band: equal 25% weight. Scores are non-negative, so
+    # int(x * 2 + 0.5) / 2 rounds to the nearest 0.5 with .25/.75 going up.
+    scores = (fluency_coherence, lexical, grammar, pronunciation)
+    fc, lex, gram, pron = (int(s * 2 + 0.5) / 2 for s in scores)
+    overall = int(sum(scores) * 0.5 + 0.5) / 2
+
+    return {
+        "overall_band": max(4.0, min(9.0, overall)),
+        "fluency_coherence": fc,
+        "lexical_resource": lex,
+        "grammatical_range": gram,
+        "pronunciation": pron,
+    }
+
+
+def compute_combined_band_batch(
+    wpm: np.ndarray,
+    pause_ratio: np.ndarray,
+    pronunciation_confidence: np.ndarray,
+    coherence: np.ndarray,
+    lexical: np.ndarray,
+    grammar: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """compute_combined_band over N candidates at once, one (N,) array per input.
+
+    Same thresholds and half-band rounding (.25/.75 round up); returns the
+    same keys as arrays.
+    """
+    wpm = np.asarray(wpm, dtype=float)
+    pause = np.asarray(pause_ratio, dtype=float)
+    rate_score = np.select(
+        [
+            (wpm >= 120) & (wpm <= 160),
+            ((wpm >= 100) & (wpm < 120)) | ((wpm > 160) & (wpm <= 180)),
+            ((wpm >= 80) & (wpm < 100)) | ((wpm > 180) & (wpm <= 200)),
+        ],
+        [9.0, 7.0, 5.5],
+        default=4.0,
+    )
+    pause_score = np.select([pause < 0.15, pause < 0.25, pause < 0.40], [9.0, 7.0, 5.5], default=4.0)
+    audio_fluency = (rate_score + pause_score) / 2
 
+    pronunciation = np.clip(np.asarray(pronunciation_confidence, dtype=float) * 10.0, 4.0, 9.0)
+    fluency_coherence = 0.5 * audio_fluency + 0.5 * np.asarray(coherence, dtype=float)
+    lexical = np.asarray(lexical, dtype=float)
+    grammar = np.asarray(grammar, dtype=float)
+
+    raw = (fluency_coherence + lexical + grammar + pronunciation) / 4
     return {
-        "overall_band": overall,
-        "fluency_coherence": round(fluency_coherence * 2) / 2,
-        "lexical_resource": round(lexical * 2) / 2,
-        "grammatical_range": round(grammar * 2) / 2,
-        "pronunciation": round(pronunciation * 2) / 2,
+        "overall_band": np.clip(np.floor(raw * 2 + 0.5) / 2, 4.0, 9.0),
+        "fluency_coherence": np.floor(fluency_coherence * 2 + 0.5) / 2,
+        "lexical_resource": np.floor(lexical * 2 + 0.5) / 2,
+        "grammatical_range": np.floor(grammar * 2 + 0.5) / 2,
+        "pronunciation": np.floor(pronunciation * 2 + 0.5) / 2,
     }
 
 
@@ -292,32 +624,61 @@ def compute_combined_band(
 # Filler detection (no API call)
 # ---------------------------------------------------------------------------
 
+# (label, pattern) — labels are what the UI shows
 FILLER_PATTERNS = [
-    r"\bum+\b",
-    r"\buh+\b",
-    r"\berm+\b",
-    r"\blike\b",
-    r"\byou know\b",
-    r"\bi mean\b",
-    r"\bbasically\b",
-    r"\bactually\b",
-    r"\bliterally\b",
-    r"\bso+\b(?=\s+(?:yeah|like|um|uh))",
-    r"\bkind of\b",
-    r"\bsort of\b",
+    ("um", r"\bum+\b"),
+    ("uh", r"\buh+\b"),
+    ("erm", r"\berm+\b"),
+    ("like", r"\blike\b"),
+    ("you know", r"\byou know\b"),
+    ("i mean", r"\bi mean\b"),
+    ("basically", r"\bbasically\b"),
+    ("actually", r"\bactually\b"),
+    ("literally", r"\bliterally\b"),
+    ("so", r"\bso+\b(?=\s+(?:yeah|like|um|uh))"),
+    ("kind of", r"\bkind of\b"),
+    ("sort of", r"\bsort of\b"),
 ]
 
+# One alternation, scanned once; group f<i> is FILLER_PATTERNS[i]
+_FILLER_RE = re.compile(
+    "|".join(f"(?P<f{i}>{pattern})" for i, (_, pattern) in enumerate(FILLER_PATTERNS))
+)
+
 
 def detect_fillers(transcript: str) -> dict[str, int]:
     """Count filler words/phrases in a transcript. No API call needed."""
-    text = transcript.lower()
-    counts: dict[str, int] = {}
-    for pattern in FILLER_PATTERNS:
-        label = pattern.replace(r"\b", "").replace("+", "").replace(r"\s+", " ")
-        label = re.sub(r"[^a-z ]", "", label).strip()
-        matches = re.findall(pattern, text)
-        if matches:
-            counts[label] = len(matches)
+    hits = Counter(m.lastgroup for m in _FILLER_RE.finditer(transcript.lower()))
+    return {
+        label: hits[f"f{i}"]
+        for i, (label, _) in enumerate(FILLER_PATTERNS)
+        if hits[f"f{i}"]
+    }
+
+
+_FILLER_COLUMN = {_FILLER_RE.groupindex[f"f{i}"]: i for i in range(len(FILLER_PATTERNS))}
+
+
+def detect_fillers_batch(transcripts: list[str]) -> np.ndarray:
+    """Filler counts for many transcripts as an (N, len(FILLER_PATTERNS)) int32 array.
+
+    Column i counts FILLER_PATTERNS[i]. The transcripts are joined with NUL
+    (neither a word character nor whitespace) and scanned in one pass.
+    """
+    counts = np.zeros((len(transcripts), len(FILLER_PATTERNS)), dtype=np.int32)
+    if not transcripts:
+        return counts
+    # Lowercase before measuring: str.lower() can change length ("İ" -> "i̇")
+    lowered = [t.lower() for t in transcripts]
+    starts = np.cumsum([0] + [len(t) + 1 for t in lowered[:-1]])
+    matches = [
+        (m.start(), _FILLER_COLUMN[m.lastindex])
+        for m in _FILLER_RE.finditer("\0".join(lowered))
+    ]
+    if matches:
+        pos, cols = np.array(matches).T
+        rows = np.searchsorted(starts, pos, side="right") - 1
+        np.add.at(counts, (rows, cols), 1)
     return counts
 
 
@@ -406,37 +767,88 @@ def evaluate_writing(
     task1_data_json: str | None = None,
 ) -> WritingEvaluation:
     """Evaluate a writing essay via Gemini."""
-    task_label = "Task 1" if task_type == 1 else "Task 2"
-    min_words = 150 if task_type == 1 else 250
-    word_count = len(essay_text.split())
+    user_prompt, word_count = _writing_prompt(
+        prompt_text, essay_text, task_type, task1_data_json
+    )
 
-    user_prompt = f"""## IELTS Writing {task_label}
+    logger.info("Gemini evaluate_writing: task=%d, word_count=%d", task_type, word_count)
+    return _generate(client, model, user_prompt, WRITING_SYSTEM_PROMPT, WritingEvaluation)
 
-**Question/Prompt:**
-{prompt_text}
 
-**Candidate's Essay ({word_count} words, minimum {min_words}):**
-{essay_text}
-"""
-    if task1_data_json:
-        user_prompt += f"\n**Chart Data (JSON):**\n{task1_data_json}\n"
+def evaluate_writing_enhanced(
+    client: genai.Client,
+    model: str,
+    prompt_text: str,
+    essay_text: str,
+    task_type: int,
+    task1_data_json: str | None = None,
+) -> WritingEnhancedReview:
+    """Evaluate writing with richer feedback: corrections, upgrades, paragraph analysis."""
+    user_prompt, word_count = _writing_prompt(
+        prompt_text, essay_text, task_type, task1_data_json
+    )
 
-    logger.info("Gemini evaluate_writing: task=%d, word_count=%d", task_type, word_count)
-    response = client.models.generate_content(
-        model=model,
-        contents=user_prompt,
-        config=genai.types.GenerateContentConfig(
-            system_instruction=WRITING_SYSTEM_PROMPT,
-            temperature=0.3,
-            response_mime_type="application/json",
-            response_schema=WritingEvaluation,
-        ),
+    logger.info("Gemini evaluate_writing_enhanced: task=%d, word_count=%d", task_type, word_count)
+    return _generate(
+        client, model, user_prompt, WRITING_ENHANCED_SYSTEM_PROMPT, WritingEnhancedReview
     )
-    logger.debug("Gemini writing raw response: %s", response.text[:500])
-    return WritingEvaluation.model_validate_json(response.text)
 
 
-def evaluate_writing_enhanced(
+# ---------------------------------------------------------------------------
+# Async evaluation (client.aio) — for grading several answers concurrently
+# ---------------------------------------------------------------------------
+
+async def aevaluate_answer(
+    client: genai.Client,
+    model: str,
+    question: str,
+    part: int,
+    transcript: str,
+    band9_answer: str = "",
+) -> ContentEvaluation:
+    """Async evaluate_answer."""
+    user_prompt = _speaking_prompt(question, part, transcript, band9_answer)
+    logger.info("Gemini aevaluate_answer: part=%d, transcript_len=%d", part, len(transcript))
+    return await _agenerate(
+        client, model, user_prompt, _speaking_system_prompt(False), ContentEvaluation
+    )
+
+
+async def aevaluate_answer_enhanced(
+    client: genai.Client,
+    model: str,
+    question: str,
+    part: int,
+    transcript: str,
+    band9_answer: str = "",
+) -> EnhancedReview:
+    """Async evaluate_answer_enhanced."""
+    user_prompt = _speaking_prompt(question, part, transcript, band9_answer)
+    logger.info(
+        "Gemini aevaluate_answer_enhanced: part=%d, transcript_len=%d", part, len(transcript)
+    )
+    return await _agenerate(
+        client, model, user_prompt, _speaking_system_prompt(True), EnhancedReview
+    )
+
+
+async def aevaluate_writing(
+    client: genai.Client,
+    model: str,
+    prompt_text: str,
+    essay_text: str,
+    task_type: int,
+    task1_data_json: str | None = None,
+) -> WritingEvaluation:
+    """Async evaluate_writing."""
+    user_prompt, word_count = _writing_prompt(
+        prompt_text, essay_text, task_type, task1_data_json
+    )
+    logger.info("Gemini aevaluate_writing: task=%d, word_count=%d", task_type, word_count)
+    return await _agenerate(client, model, user_prompt, WRITING_SYSTEM_PROMPT, WritingEvaluation)
+
+
+async def aevaluate_writing_enhanced(
     client: genai.Client,
     model: str,
     prompt_text: str,
@@ -444,48 +856,176 @@ def evaluate_writing_enhanced(
     task_type: int,
     task1_data_json: str | None = None,
 ) -> WritingEnhancedReview:
-    """Evaluate writing with richer feedback: corrections, upgrades, paragraph analysis."""
-    task_label = "Task 1" if task_type == 1 else "Task 2"
-    min_words = 150 if task_type == 1 else 250
-    word_count = len(essay_text.split())
+    """Async evaluate_writing_enhanced."""
+    user_prompt, word_count = _writing_prompt(
+        prompt_text, essay_text, task_type, task1_data_json
+    )
+    logger.info("Gemini aevaluate_writing_enhanced: task=%d, word_count=%d", task_type, word_count)
+    return await _agenerate(
+        client, model, user_prompt, WRITING_ENHANCED_SYSTEM_PROMPT, WritingEnhancedReview
+    )
 
-    user_prompt = f"""## IELTS Writing {task_label}
 
-**Question/Prompt:**
-{prompt_text}
+# ---------------------------------------------------------------------------
+# Batch evaluation (Gemini Batch API: half price, finishes within 24h)
+# ---------------------------------------------------------------------------
 
-**Candidate's Essay ({word_count} words, minimum {min_words}):**
-{essay_text}
-"""
-    if task1_data_json:
-        user_prompt += f"\n**Chart Data (JSON):**\n{task1_data_json}\n"
+_BATCH_DONE_STATES = {
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_PARTIALLY_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+}
 
-    logger.info("Gemini evaluate_writing_enhanced: task=%d, word_count=%d", task_type, word_count)
-    response = client.models.generate_content(
+
+def submit_answers_batch(
+    client: genai.Client,
+    model: str,
+    items: list[dict],
+    enhanced: bool = False,
+) -> str:
+    """Queue speaking evaluations as one Gemini batch job for offline grading.
+
+    Each item holds evaluate_answer's keyword arguments (question, part,
+    transcript, optional band9_answer). Returns the job name to pass to
+    collect_answers_batch.
+    """
+    return _submit_batch(
+        client, model,
+        [_speaking_prompt(**item) for item in items],
+        system_prompt=_speaking_system_prompt(enhanced),
+        schema=EnhancedReview if enhanced else ContentEvaluation,
+        display_name="ielts-speaking",
+    )
+
+
+def collect_answers_batch(
+    client: genai.Client,
+    job_name: str,
+    enhanced: bool = False,
+) -> list[ContentEvaluation | EnhancedReview | None] | None:
+    """Results of a submit_answers_batch job, in input order.
+
+    Returns None while the job is still running; failed items come back as None.
+    """
+    return _collect_batch(client, job_name, EnhancedReview if enhanced else ContentEvaluation)
+
+
+def evaluate_mock_test_batch(
+    client: genai.Client,
+    model: str,
+    state: MockTestState,
+    poll_interval: float = 30.0,
+) -> list[EnhancedReview | None]:
+    """Score every unevaluated response of a mock test in one batch job.
+
+    Blocks until the job finishes (batch jobs can take minutes), then fills in
+    evaluation and combined_band on each response it scored. Returns one
+    result per submitted response, in order (None where that request failed).
+    Interactive scoring stays on evaluate_answer_enhanced.
+    """
+    pending = [r for r in state.responses if r.evaluation is None and r.transcript.strip()]
+    if not pending:
+        return []
+
+    job_name = submit_answers_batch(client, model, [
+        {
+            "question": r.question.question.text,
+            "part": r.question.question.part,
+            "transcript": r.transcript,
+            "band9_answer": r.question.band9_answer,
+        }
+        for r in pending
+    ], enhanced=True)
+    while (results := collect_answers_batch(client, job_name, enhanced=True)) is None:
+        time.sleep(poll_interval)
+
+    for response, review in zip(pending, results):
+        if review is not None:
+            response.evaluation = review
+            response.combined_band = compute_combined_band(review, response.audio_metrics)
+    return results
+
+
+def submit_writing_batch(
+    client: genai.Client,
+    model: str,
+    items: list[dict],
+    enhanced: bool = False,
+) -> str:
+    """Queue writing evaluations as one Gemini batch job for offline grading.
+
+    Each item holds evaluate_writing's keyword arguments (prompt_text,
+    essay_text, task_type, optional task1_data_json).
+    """
+    return _submit_batch(
+        client, model,
+        [_writing_prompt(**item)[0] for item in items],
+        system_prompt=WRITING_ENHANCED_SYSTEM_PROMPT if enhanced else WRITING_SYSTEM_PROMPT,
+        schema=WritingEnhancedReview if enhanced else WritingEvaluation,
+        display_name="ielts-writing",
+    )
+
+
+def collect_writing_batch(
+    client: genai.Client,
+    job_name: str,
+    enhanced: bool = False,
+) -> list[WritingEvaluation | WritingEnhancedReview | None] | None:
+    """Results of a submit_writing_batch job, in input order (None while running)."""
+    return _collect_batch(
+        client, job_name, WritingEnhancedReview if enhanced else WritingEvaluation
+    )
+
+
+def _submit_batch(
+    client: genai.Client,
+    model: str,
+    prompts: list[str],
+    system_prompt: str,
+    schema: type,
+    display_name: str,
+) -> str:
+    config = _config(system_prompt, schema, _thinking_budget(model))
+    job = client.batches.create(
         model=model,
-        contents=user_prompt,
-        config=genai.types.GenerateContentConfig(
-            system_instruction=WRITING_ENHANCED_SYSTEM_PROMPT,
-            temperature=0.3,
-            response_mime_type="application/json",
-            response_schema=WritingEnhancedReview,
-        ),
+        src=[genai.types.InlinedRequest(contents=p, config=config) for p in prompts],
+        config=genai.types.CreateBatchJobConfig(display_name=display_name),
     )
-    logger.debug("Gemini writing enhanced raw response: %s", response.text[:500])
-    return WritingEnhancedReview.model_validate_json(response.text)
+    logger.info("Gemini batch submitted: %s (%d requests)", job.name, len(prompts))
+    return job.name
+
+
+def _collect_batch(client: genai.Client, job_name: str, schema: type) -> list | None:
+    job = client.batches.get(name=job_name)
+    state = job.state.name if job.state else ""
+    if state not in _BATCH_DONE_STATES:
+        return None
+    if not job.dest or job.dest.inlined_responses is None:
+        raise RuntimeError(f"Gemini batch {job_name} ended with {state}: {job.error}")
+
+    results = []
+    for i, item in enumerate(job.dest.inlined_responses):
+        if item.error or not item.response or not item.response.text:
+            logger.warning("Gemini batch %s: request %d failed: %s", job_name, i, item.error)
+            results.append(None)
+        else:
+            results.append(schema.model_validate_json(item.response.text))
+    return results
 
 
 def compute_writing_band(
     eval_result: WritingEvaluation | WritingEnhancedReview,
 ) -> float:
-    """Average of 4 writing criteria, rounded to nearest 0.5."""
+    """Average of 4 writing criteria, rounded to nearest 0.5 (.25/.75 round up)."""
     raw = (
         eval_result.task_achievement.score
         + eval_result.coherence.score
         + eval_result.lexical_resource.score
         + eval_result.grammatical_range.score
-    ) / 4
-    return round(raw * 2) / 2
+    ) * 0.25
+    return int(raw * 2 + 0.5) / 2
 
 
 def writing_quality_checks(essay_text: str, task_type: int) -> dict:
@@ -11,7 +11,7 @@ from pydantic import BaseModel, Field
 # Question models (migrated from questions.py, extended)
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class Question:
     part: int  # 1, 2, or 3
     topic: str  # e.g. "Flowers and plants"
@@ -22,7 +22,7 @@ class Question:
     test: str = ""  # e.g. "Test A" (legacy)
 
 
-@dataclass
+@dataclass(slots=True)
 class QuestionWithAnswer:
     question: Question
     band9_answer: str = ""
@@ -107,14 +107,14 @@ class EnhancedReview(BaseModel):
 # Mock test models (new)
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class MockTestPlan:
     part1_questions: list[QuestionWithAnswer] = field(default_factory=list)
     part2_cue_card: QuestionWithAnswer | None = None
     part3_questions: list[QuestionWithAnswer] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class MockTestResponse:
     question: QuestionWithAnswer
     transcript: str = ""
@@ -123,7 +123,7 @@ class MockTestResponse:
     combined_band: dict = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class MockTestState:
     plan: MockTestPlan
     current_part: int = 1  # 1, 2, or 3
@@ -137,7 +137,7 @@ class MockTestState:
 # Database record models (new)
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class SessionRecord:
     id: int | None = None
     timestamp: str = ""
@@ -146,7 +146,7 @@ class SessionRecord:
     attempt_count: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class AttemptRecord:
     id: int | None = None
     session_id: int = 0
@@ -228,7 +228,7 @@ class WritingEnhancedReview(BaseModel):
 # Writing data models
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class WritingPrompt:
     id: int
     test_type: str          # 'academic' | 'gt'
@@ -239,7 +239,7 @@ class WritingPrompt:
     task1_data_json: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class WritingAttemptRecord:
     id: int | None = None
     session_id: int = 0
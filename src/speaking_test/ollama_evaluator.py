@@ -16,6 +16,8 @@ from speaking_test.gemini_evaluator import (
     SYSTEM_PROMPT,
     WRITING_SYSTEM_PROMPT,
     WRITING_ENHANCED_SYSTEM_PROMPT,
+    _speaking_prompt,
+    _writing_prompt,
 )
 from speaking_test.models import (
     EnhancedReview,
@@ -216,23 +218,6 @@ def _chat(system: str, user: str) -> str:
     return _extract_json(cleaned)
 
 
-def _build_user_prompt(question: str, part: int, transcript: str, band9_answer: str) -> str:
-    """Build the user prompt (shared between standard and enhanced evaluation)."""
-    prompt = f"""## IELTS Speaking Part {part}
-
-**Question:** {question}
-
-**Candidate's Answer (transcribed from speech):**
-{transcript}
-"""
-    if band9_answer:
-        prompt += f"""
-**Reference Answer (for question scope only — do NOT compare or score against this):**
-{band9_answer}
-"""
-    return prompt
-
-
 def is_available() -> bool:
     """Check if the Ollama server is reachable."""
     try:
@@ -250,7 +235,7 @@ def evaluate_answer(
 ) -> ContentEvaluation:
     """Send a candidate's transcript to Ollama for IELTS content evaluation."""
     system = SYSTEM_PROMPT + "\n\n" + _EVALUATION_SCHEMA
-    user = _build_user_prompt(question, part, transcript, band9_answer)
+    user = _speaking_prompt(question, part, transcript, band9_answer)
     raw_json = _chat(system, user)
     logger.info("Ollama raw response: %s", raw_json)
     data = json.loads(raw_json)
@@ -268,7 +253,7 @@ def evaluate_answer_enhanced(
 ) -> EnhancedReview:
     """Evaluate with richer feedback: grammar corrections, vocab upgrades, etc."""
     system = ENHANCED_SYSTEM_PROMPT + "\n\n" + _ENHANCED_SCHEMA
-    user = _build_user_prompt(question, part, transcript, band9_answer)
+    user = _speaking_prompt(question, part, transcript, band9_answer)
     raw_json = _chat(system, user)
     logger.info("Ollama enhanced raw response: %s", raw_json)
     data = json.loads(raw_json)
@@ -398,28 +383,6 @@ def _normalize_writing_evaluation(raw: dict) -> dict:
     return raw
 
 
-def _build_writing_user_prompt(
-    prompt_text: str, essay_text: str, task_type: int,
-    task1_data_json: str | None = None,
-) -> str:
-    """Build user prompt for writing evaluation."""
-    task_label = "Task 1" if task_type == 1 else "Task 2"
-    min_words = 150 if task_type == 1 else 250
-    word_count = len(essay_text.split())
-
-    prompt = f"""## IELTS Writing {task_label}
-
-**Question/Prompt:**
-{prompt_text}
-
-**Candidate's Essay ({word_count} words, minimum {min_words}):**
-{essay_text}
-"""
-    if task1_data_json:
-        prompt += f"\n**Chart Data (JSON):**\n{task1_data_json}\n"
-    return prompt
-
-
 def evaluate_writing(
     prompt_text: str,
     essay_text: str,
@@ -428,7 +391,7 @@ def evaluate_writing(
 ) -> WritingEvaluation:
     """Evaluate a writing essay via Ollama."""
     system = WRITING_SYSTEM_PROMPT + "\n\n" + _WRITING_EVALUATION_SCHEMA
-    user = _build_writing_user_prompt(prompt_text, essay_text, task_type, task1_data_json)
+    user, _ = _writing_prompt(prompt_text, essay_text, task_type, task1_data_json)
     raw_json = _chat(system, user)
     logger.info("Ollama writing raw response: %s", raw_json)
     data = json.loads(raw_json)
@@ -445,7 +408,7 @@ def evaluate_writing_enhanced(
 ) -> WritingEnhancedReview:
     """Evaluate writing with richer feedback via Ollama."""
     system = WRITING_ENHANCED_SYSTEM_PROMPT + "\n\n" + _WRITING_ENHANCED_SCHEMA
-    user = _build_writing_user_prompt(prompt_text, essay_text, task_type, task1_data_json)
+    user, _ = _writing_prompt(prompt_text, essay_text, task_type, task1_data_json)
     raw_json = _chat(system, user)
     logger.info("Ollama writing enhanced raw response: %s", raw_json)
     data = json.loads(raw_json)
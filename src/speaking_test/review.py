@@ -140,6 +140,15 @@ def render_review(
             pitch_chart_fn(audio_path)
 
 
+# Attempt columns read by render_review_from_dict
+REVIEW_COLUMNS = (
+    "id", "part", "question_text", "overall_band", "fluency_coherence",
+    "lexical_resource", "grammatical_range", "pronunciation", "examiner_feedback",
+    "grammar_corrections", "vocabulary_upgrades", "strengths", "improvement_tips",
+    "pronunciation_warnings", "transcript", "band9_answer",
+)
+
+
 def render_review_from_dict(attempt: dict) -> None:
     """Render a review from a database attempt dict (for History mode)."""
     # Band scores
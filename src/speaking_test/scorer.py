@@ -86,6 +86,14 @@ def analyze_audio(audio_path: str, transcript: str, words: list) -> dict:
     }
 
 
+def pitch_track(y: np.ndarray, sr: int) -> tuple[np.ndarray, np.ndarray]:
+    """pyin (f0, voiced) over ``y`` for the pitch contour chart."""
+    import librosa
+
+    f0, voiced, _ = librosa.pyin(y, fmin=50, fmax=500, sr=sr)
+    return f0, voiced
+
+
 def estimate_band(wer_score: float, metrics: dict) -> float:
     """Estimate an IELTS band score from WER and speech metrics."""
     # Accuracy score from WER (0 = perfect, 1 = all wrong)